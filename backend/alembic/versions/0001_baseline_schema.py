@@ -0,0 +1,309 @@
+"""baseline schema
+
+The tables as Base.metadata.create_all() built them before migrations
+were introduced. Databases that already have them are adopted as-is.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 12:19:36.426650
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("users"):
+        # Created by create_all() before migrations existed; adopt as-is
+        return
+
+    op.create_table('content',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('content_type', sa.String(), nullable=False),
+    sa.Column('provider', sa.String(), nullable=True),
+    sa.Column('author', sa.String(), nullable=True),
+    sa.Column('instructor', sa.String(), nullable=True),
+    sa.Column('difficulty_level', sa.String(), nullable=True),
+    sa.Column('duration_hours', sa.Float(), nullable=True),
+    sa.Column('language', sa.String(), nullable=True),
+    sa.Column('format', sa.String(), nullable=True),
+    sa.Column('rating', sa.Float(), nullable=True),
+    sa.Column('review_count', sa.Integer(), nullable=True),
+    sa.Column('popularity_score', sa.Float(), nullable=True),
+    sa.Column('quality_score', sa.Float(), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('skills_covered', sa.JSON(), nullable=True),
+    sa.Column('prerequisites', sa.JSON(), nullable=True),
+    sa.Column('learning_outcomes', sa.JSON(), nullable=True),
+    sa.Column('is_free', sa.Boolean(), nullable=True),
+    sa.Column('price', sa.Float(), nullable=True),
+    sa.Column('currency', sa.String(), nullable=True),
+    sa.Column('requires_subscription', sa.Boolean(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('last_updated', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_content_id'), 'content', ['id'], unique=False)
+    op.create_index(op.f('ix_content_title'), 'content', ['title'], unique=False)
+
+    op.create_table('skills',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('subcategory', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_trending', sa.Boolean(), nullable=True),
+    sa.Column('difficulty_level', sa.String(), nullable=True),
+    sa.Column('market_demand', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_skills_id'), 'skills', ['id'], unique=False)
+    op.create_index(op.f('ix_skills_name'), 'skills', ['name'], unique=True)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_superuser', sa.Boolean(), nullable=True),
+    sa.Column('job_title', sa.String(), nullable=True),
+    sa.Column('company', sa.String(), nullable=True),
+    sa.Column('industry', sa.String(), nullable=True),
+    sa.Column('experience_level', sa.String(), nullable=True),
+    sa.Column('career_goals', sa.Text(), nullable=True),
+    sa.Column('preferred_learning_style', sa.String(), nullable=True),
+    sa.Column('resume_text', sa.Text(), nullable=True),
+    sa.Column('resume_filename', sa.String(), nullable=True),
+    sa.Column('linkedin_profile', sa.String(), nullable=True),
+    sa.Column('github_profile', sa.String(), nullable=True),
+    sa.Column('portfolio_url', sa.String(), nullable=True),
+    sa.Column('learning_preferences', sa.JSON(), nullable=True),
+    sa.Column('notification_preferences', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    op.create_table('learning_paths',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('goal', sa.Text(), nullable=True),
+    sa.Column('difficulty_level', sa.String(), nullable=True),
+    sa.Column('estimated_duration_weeks', sa.Integer(), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('progress_percentage', sa.Float(), nullable=True),
+    sa.Column('generated_by_ai', sa.Boolean(), nullable=True),
+    sa.Column('ai_confidence_score', sa.Float(), nullable=True),
+    sa.Column('generation_prompt', sa.Text(), nullable=True),
+    sa.Column('user_preferences', sa.JSON(), nullable=True),
+    sa.Column('career_alignment_score', sa.Float(), nullable=True),
+    sa.Column('business_relevance_score', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_accessed', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_learning_paths_id'), 'learning_paths', ['id'], unique=False)
+
+    op.create_table('user_skills',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('proficiency_level', sa.Float(), nullable=False),
+    sa.Column('confidence_level', sa.Float(), nullable=True),
+    sa.Column('years_of_experience', sa.Float(), nullable=True),
+    sa.Column('source', sa.String(), nullable=True),
+    sa.Column('evidence', sa.Text(), nullable=True),
+    sa.Column('is_learning_goal', sa.Boolean(), nullable=True),
+    sa.Column('target_proficiency', sa.Float(), nullable=True),
+    sa.Column('priority', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_assessed', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_skills_id'), 'user_skills', ['id'], unique=False)
+
+    op.create_table('content_recommendations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('content_id', sa.Integer(), nullable=False),
+    sa.Column('recommendation_score', sa.Float(), nullable=False),
+    sa.Column('recommendation_reason', sa.Text(), nullable=True),
+    sa.Column('recommendation_type', sa.String(), nullable=True),
+    sa.Column('skill_relevance_score', sa.Float(), nullable=True),
+    sa.Column('career_alignment_score', sa.Float(), nullable=True),
+    sa.Column('difficulty_match_score', sa.Float(), nullable=True),
+    sa.Column('learning_style_match_score', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('user_rating', sa.Float(), nullable=True),
+    sa.Column('user_feedback', sa.Text(), nullable=True),
+    sa.Column('recommended_for_skill', sa.String(), nullable=True),
+    sa.Column('recommended_in_path_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('viewed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['content_id'], ['content.id'], ),
+    sa.ForeignKeyConstraint(['recommended_in_path_id'], ['learning_paths.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_content_recommendations_id'), 'content_recommendations', ['id'], unique=False)
+
+    op.create_table('learning_path_steps',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('learning_path_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('step_number', sa.Integer(), nullable=False),
+    sa.Column('step_type', sa.String(), nullable=True),
+    sa.Column('content_url', sa.String(), nullable=True),
+    sa.Column('content_provider', sa.String(), nullable=True),
+    sa.Column('estimated_duration_hours', sa.Float(), nullable=True),
+    sa.Column('prerequisites', sa.JSON(), nullable=True),
+    sa.Column('dependencies', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('progress_percentage', sa.Float(), nullable=True),
+    sa.Column('learning_objectives', sa.JSON(), nullable=True),
+    sa.Column('skills_gained', sa.JSON(), nullable=True),
+    sa.Column('difficulty_rating', sa.Float(), nullable=True),
+    sa.Column('is_mandatory', sa.Boolean(), nullable=True),
+    sa.Column('user_rating', sa.Float(), nullable=True),
+    sa.Column('user_notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['learning_path_id'], ['learning_paths.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_learning_path_steps_id'), 'learning_path_steps', ['id'], unique=False)
+
+    op.create_table('feedback',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('feedback_type', sa.String(), nullable=False),
+    sa.Column('content_id', sa.Integer(), nullable=True),
+    sa.Column('learning_path_id', sa.Integer(), nullable=True),
+    sa.Column('learning_path_step_id', sa.Integer(), nullable=True),
+    sa.Column('rating', sa.Float(), nullable=True),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('content_quality_rating', sa.Float(), nullable=True),
+    sa.Column('difficulty_rating', sa.Float(), nullable=True),
+    sa.Column('relevance_rating', sa.Float(), nullable=True),
+    sa.Column('engagement_rating', sa.Float(), nullable=True),
+    sa.Column('is_positive', sa.Boolean(), nullable=True),
+    sa.Column('is_constructive', sa.Boolean(), nullable=True),
+    sa.Column('sentiment_score', sa.Float(), nullable=True),
+    sa.Column('is_anonymous', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('helpfulness_score', sa.Float(), nullable=True),
+    sa.Column('response_from_provider', sa.Text(), nullable=True),
+    sa.Column('is_resolved', sa.Boolean(), nullable=True),
+    sa.Column('resolution_notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('responded_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['content_id'], ['content.id'], ),
+    sa.ForeignKeyConstraint(['learning_path_id'], ['learning_paths.id'], ),
+    sa.ForeignKeyConstraint(['learning_path_step_id'], ['learning_path_steps.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_feedback_id'), 'feedback', ['id'], unique=False)
+
+    op.create_table('progress',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('content_id', sa.Integer(), nullable=True),
+    sa.Column('learning_path_id', sa.Integer(), nullable=True),
+    sa.Column('learning_path_step_id', sa.Integer(), nullable=True),
+    sa.Column('progress_type', sa.String(), nullable=False),
+    sa.Column('progress_percentage', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('time_spent_minutes', sa.Integer(), nullable=True),
+    sa.Column('sessions_count', sa.Integer(), nullable=True),
+    sa.Column('completion_rate', sa.Float(), nullable=True),
+    sa.Column('accuracy_score', sa.Float(), nullable=True),
+    sa.Column('engagement_score', sa.Float(), nullable=True),
+    sa.Column('learning_velocity', sa.Float(), nullable=True),
+    sa.Column('difficulty_rating', sa.Float(), nullable=True),
+    sa.Column('effectiveness_rating', sa.Float(), nullable=True),
+    sa.Column('milestones_reached', sa.JSON(), nullable=True),
+    sa.Column('badges_earned', sa.JSON(), nullable=True),
+    sa.Column('certificates_earned', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_activity', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['content_id'], ['content.id'], ),
+    sa.ForeignKeyConstraint(['learning_path_id'], ['learning_paths.id'], ),
+    sa.ForeignKeyConstraint(['learning_path_step_id'], ['learning_path_steps.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_progress_id'), 'progress', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_progress_id'), table_name='progress')
+    op.drop_table('progress')
+
+    op.drop_index(op.f('ix_feedback_id'), table_name='feedback')
+    op.drop_table('feedback')
+
+    op.drop_index(op.f('ix_learning_path_steps_id'), table_name='learning_path_steps')
+    op.drop_table('learning_path_steps')
+
+    op.drop_index(op.f('ix_content_recommendations_id'), table_name='content_recommendations')
+    op.drop_table('content_recommendations')
+
+    op.drop_index(op.f('ix_user_skills_id'), table_name='user_skills')
+    op.drop_table('user_skills')
+
+    op.drop_index(op.f('ix_learning_paths_id'), table_name='learning_paths')
+    op.drop_table('learning_paths')
+
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+
+    op.drop_index(op.f('ix_skills_name'), table_name='skills')
+    op.drop_index(op.f('ix_skills_id'), table_name='skills')
+    op.drop_table('skills')
+
+    op.drop_index(op.f('ix_content_title'), table_name='content')
+    op.drop_index(op.f('ix_content_id'), table_name='content')
+    op.drop_table('content')
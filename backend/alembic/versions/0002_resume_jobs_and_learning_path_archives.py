@@ -0,0 +1,92 @@
+"""resume jobs and learning path archives
+
+Schema that was added to the models while create_all() still built the
+database: the resume job queue, cold-storage archives, the history keyset
+index and the one-row-per-(user, skill) constraint on user_skills. Each
+step is skipped when create_all() already created it.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:19:54.249354
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def _has_index(inspector, table: str, name: str) -> bool:
+    return any(ix["name"] == name for ix in inspector.get_indexes(table))
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('resume_jobs'):
+        op.create_table('resume_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=True),
+        sa.Column('file_path', sa.String(), nullable=False),
+        sa.Column('file_kind', sa.String(), nullable=False),
+        sa.Column('file_digest', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_resume_jobs_id'), 'resume_jobs', ['id'], unique=False)
+        op.create_index(op.f('ix_resume_jobs_status'), 'resume_jobs', ['status'], unique=False)
+        op.create_index(op.f('ix_resume_jobs_user_id'), 'resume_jobs', ['user_id'], unique=False)
+
+    if not inspector.has_table('learning_path_archives'):
+        op.create_table('learning_path_archives',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('progress_percentage', sa.Float(), nullable=True),
+        sa.Column('estimated_duration_weeks', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_learning_path_archives_user_id_created_at', 'learning_path_archives', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+    if not _has_index(inspector, 'learning_paths', 'ix_learning_paths_user_id_created_at'):
+        op.create_index('ix_learning_paths_user_id_created_at', 'learning_paths', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+    if not any(uc["name"] == 'uq_user_skills_user_id_skill_id' for uc in inspector.get_unique_constraints('user_skills')):
+        # Keep the newest row of any duplicated (user, skill) pair
+        op.execute(
+            "DELETE FROM user_skills WHERE id NOT IN "
+            "(SELECT max(id) FROM user_skills GROUP BY user_id, skill_id)"
+        )
+        with op.batch_alter_table('user_skills', schema=None) as batch_op:
+            batch_op.create_unique_constraint('uq_user_skills_user_id_skill_id', ['user_id', 'skill_id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('user_skills', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_user_skills_user_id_skill_id', type_='unique')
+
+    op.drop_index('ix_learning_paths_user_id_created_at', table_name='learning_paths')
+
+    op.drop_index('ix_learning_path_archives_user_id_created_at', table_name='learning_path_archives')
+    op.drop_table('learning_path_archives')
+
+    op.drop_index(op.f('ix_resume_jobs_user_id'), table_name='resume_jobs')
+    op.drop_index(op.f('ix_resume_jobs_status'), table_name='resume_jobs')
+    op.drop_index(op.f('ix_resume_jobs_id'), table_name='resume_jobs')
+    op.drop_table('resume_jobs')
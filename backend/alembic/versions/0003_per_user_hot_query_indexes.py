@@ -0,0 +1,43 @@
+"""per-user hot query indexes
+
+Indexes for the per-user lookups in roadmap_generator.py and users.py.
+user_skills is already covered by uq_user_skills_user_id_skill_id and
+learning_paths history by ix_learning_paths_user_id_created_at (0002).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:20:13.838306
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def _has_index(inspector, table: str, name: str) -> bool:
+    return any(ix["name"] == name for ix in inspector.get_indexes(table))
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not _has_index(inspector, 'learning_path_steps', 'ix_learning_path_steps_learning_path_id_step_number'):
+        op.create_index('ix_learning_path_steps_learning_path_id_step_number', 'learning_path_steps', ['learning_path_id', 'step_number'], unique=False)
+
+    if not _has_index(inspector, 'learning_paths', 'uq_learning_paths_one_active_per_user'):
+        # Older rows may have several active paths per user; keep the newest
+        op.execute(
+            "UPDATE learning_paths SET status = 'archived' "
+            "WHERE status = 'active' AND id NOT IN "
+            "(SELECT max(id) FROM learning_paths WHERE status = 'active' GROUP BY user_id)"
+        )
+        op.create_index('uq_learning_paths_one_active_per_user', 'learning_paths', ['user_id'], unique=True, postgresql_where=sa.text("status = 'active'"), sqlite_where=sa.text("status = 'active'"))
+
+
+def downgrade() -> None:
+    op.drop_index('uq_learning_paths_one_active_per_user', table_name='learning_paths')
+    op.drop_index('ix_learning_path_steps_learning_path_id_step_number', table_name='learning_path_steps')
@@ -0,0 +1,34 @@
+"""normalize sqlite learning path timestamps
+
+On SQLite, rows created through the CURRENT_TIMESTAMP server default were
+stored as 'YYYY-MM-DD HH:MM:SS' while SQLAlchemy binds
+'YYYY-MM-DD HH:MM:SS.ffffff', so equal instants compared unequal as text.
+created_at is now set client-side; this pads the old rows so the history
+keyset can compare the raw, indexed column. No-op on other backends.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:05:12.480311
+"""
+from alembic import op
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in ('learning_paths', 'learning_path_archives'):
+        op.execute(
+            f"UPDATE {table} SET created_at = created_at || '.000000' "
+            "WHERE created_at IS NOT NULL AND length(created_at) = 19"
+        )
+
+
+def downgrade() -> None:
+    # The padded values are still valid timestamps; nothing to undo
+    pass
@@ -0,0 +1,31 @@
+"""resume job retry backoff
+
+Adds resume_jobs.not_before, the earliest time a job put back in the queue
+after a failure may be claimed again. Skipped when create_all() already
+added the column.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 15:10:37.204519
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns('resume_jobs')}
+    if 'not_before' in columns:
+        return
+    with op.batch_alter_table('resume_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('not_before', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resume_jobs', schema=None) as batch_op:
+        batch_op.drop_column('not_before')
@@ -2,7 +2,7 @@
 API v1 router aggregator
 """
 from fastapi import APIRouter
-from .endpoints import auth, users, resume, roadmap, recommendations
+from .endpoints import auth, users, resume, roadmap, recommendations, admin
 
 api_router = APIRouter()
 
@@ -11,3 +11,4 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(resume.router, prefix="/resume", tags=["resume"])
 api_router.include_router(roadmap.router, prefix="/roadmap", tags=["roadmap"])
 api_router.include_router(recommendations.router, prefix="/recommendations", tags=["recommendations"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,62 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_superuser, get_db_session
+from app.models.user import User
+from app.schemas.user import Principal, UserOut
+from app.services.curated_catalog import get_catalog, reload_catalog
+from app.services.principals import invalidate_principal
+from app.services.roadmap_archive import archive_old_paths
+from app.services.skills_service import get_snapshot, reload_taxonomy
+from app.utils.cache import cache_stats
+
+router = APIRouter()
+
+@router.get("/taxonomy")
+def taxonomy_info(current_user: Principal = Depends(get_current_superuser)):
+    snap = get_snapshot()
+    return {"version": snap.version, "skills": len(snap.index.entries)}
+
+@router.post("/taxonomy/reload")
+def taxonomy_reload(current_user: Principal = Depends(get_current_superuser)):
+    previous = get_snapshot().version
+    snap = reload_taxonomy()
+    return {"previous_version": previous, "version": snap.version, "skills": len(snap.index.entries)}
+
+@router.post("/curated/reload")
+def curated_reload(current_user: Principal = Depends(get_current_superuser)):
+    previous = get_catalog().version
+    catalog = reload_catalog()
+    return {"previous_version": previous, "version": catalog.version, "items": catalog.size}
+
+@router.get("/caches")
+def caches(current_user: Principal = Depends(get_current_superuser)):
+    return cache_stats()
+
+@router.post("/roadmap/archive")
+def roadmap_archive(
+    older_than_days: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_db_session),
+    current_user: Principal = Depends(get_current_superuser),
+):
+    # Same pass the archiver process runs on its interval
+    return {"archived": archive_old_paths(db, older_than_days)}
+
+@router.patch("/users/{user_id}/active", response_model=UserOut)
+def set_user_active(
+    user_id: int,
+    active: bool,
+    db: Session = Depends(get_db_session),
+    current_user: Principal = Depends(get_current_superuser),
+):
+    user = db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    user.is_active = active
+    db.commit()
+    db.refresh(user)
+    # Deactivation must take effect on this worker's next request, not after the TTL
+    invalidate_principal(user.username)
+    return user
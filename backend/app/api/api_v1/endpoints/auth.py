@@ -1,44 +1,96 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db_session
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import HashingSaturated, create_access_token, hash_password, verify_and_update_password
 from app.core.config import settings
 from app.models.user import User
-from app.schemas.auth import Token, RegisterRequest
+from app.schemas.auth import Token, RegisterRequest, RefreshRequest
+from app.services.refresh_tokens import InvalidRefreshToken, issue_refresh_token, rotate_refresh_token
 
 router = APIRouter()
 
-@router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db_session)):
-    user = db.query(User).filter((User.username == form_data.username) | (User.email == form_data.username)).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username},
-        expires_delta=access_token_expires,
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": "2"},
     )
-    return {"access_token": access_token, "token_type": "bearer"}
 
-@router.post("/register", response_model=Token)
-def register(payload: RegisterRequest, db: Session = Depends(get_db_session)):
-    existing = db.query(User).filter((User.username == payload.username) | (User.email == payload.email)).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="User with this email or username already exists")
+# login/register are async so they can await the hashing pool; their
+# blocking Session work goes through these helpers on the threadpool. The
+# helpers commit, which expires the User, so they hand back plain values.
+
+def _find_user(db: Session, username: str, email: str) -> User | None:
+    return db.query(User).filter((User.username == username) | (User.email == email)).first()
+
+def _complete_login(db: Session, user: User, new_hash: str | None) -> tuple[str, str]:
+    username = user.username
+    if new_hash:
+        # Stored hash predates the current bcrypt cost; upgrade it transparently
+        # (committed together with the refresh token)
+        user.hashed_password = new_hash
+    return username, issue_refresh_token(db, user)
+
+def _create_user(db: Session, payload: RegisterRequest, hashed_password: str) -> tuple[str, str]:
     user = User(
         email=payload.email,
         username=payload.username,
         full_name=payload.full_name,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=hashed_password,
         is_active=True,
         is_superuser=False,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
+    return user.username, issue_refresh_token(db, user)
+
+@router.post("/login", response_model=Token)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db_session)):
+    user = await run_in_threadpool(_find_user, db, form_data.username, form_data.username)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
+    try:
+        valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+    except HashingSaturated:
+        raise _hashing_busy()
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
+    username, refresh_token = await run_in_threadpool(_complete_login, db, user, new_hash)
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": username},
+        expires_delta=access_token_expires,
+    )
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
 
+@router.post("/refresh", response_model=Token)
+def refresh(payload: RefreshRequest, db: Session = Depends(get_db_session)):
+    # Indexed token lookup instead of a password hash check; the refresh token rotates
+    try:
+        user, refresh_token = rotate_refresh_token(db, payload.refresh_token)
+    except InvalidRefreshToken as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     access_token = create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/register", response_model=Token)
+async def register(payload: RegisterRequest, db: Session = Depends(get_db_session)):
+    existing = await run_in_threadpool(_find_user, db, payload.username, payload.email)
+    if existing:
+        raise HTTPException(status_code=400, detail="User with this email or username already exists")
+    try:
+        hashed_password = await hash_password(payload.password)
+    except HashingSaturated:
+        raise _hashing_busy()
+    username, refresh_token = await run_in_threadpool(_create_user, db, payload, hashed_password)
+
+    access_token = create_access_token(data={"sub": username})
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
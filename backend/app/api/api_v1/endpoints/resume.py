@@ -1,21 +1,87 @@
+from contextlib import contextmanager
 from typing import List
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db_session, get_current_user
-from app.models.user import User
+from app.api.deps import get_db_session, get_current_user, get_current_superuser
+from app.schemas.user import Principal
+from app.schemas.resume_job import ResumeJobCreated, ResumeJobOut
 from app.schemas.skill import UserSkillOut
+from app.services.resume_import import collect_import_items, run_import
+from app.services.resume_jobs import enqueue_resume_job, get_resume_job
 from app.services.resume_parser import persist_user_skills_from_resume
+from app.services.text_extraction import ExtractionSaturated, ExtractionTimeout
+from app.utils.file_utils import UnsupportedFileType, UploadTooLarge, spool_upload
 
 router = APIRouter()
 
+@contextmanager
+def _upload_errors():
+    """Translate upload/extraction failures into HTTP errors."""
+    try:
+        yield
+    except ExtractionSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Resume processing is busy, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+    except ExtractionTimeout:
+        raise HTTPException(status_code=504, detail="Resume processing timed out")
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedFileType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
 @router.post("/upload", response_model=List[UserSkillOut])
 async def upload_resume(
     file: UploadFile = File(...),
     db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file uploaded")
-    skills = await persist_user_skills_from_resume(file, db, current_user)
+    with _upload_errors():
+        skills = await persist_user_skills_from_resume(file, db, current_user)
     return skills
+
+@router.post("/jobs", response_model=ResumeJobCreated, status_code=202)
+async def create_resume_job(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db_session),
+    current_user: Principal = Depends(get_current_user),
+):
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    with _upload_errors():
+        upload = await spool_upload(file)
+    try:
+        job = enqueue_resume_job(db, current_user, upload, file.filename)
+    except Exception:
+        upload.cleanup()
+        raise
+    return {"id": job.id, "status": job.status}
+
+@router.get("/jobs/{job_id}", response_model=ResumeJobOut)
+def read_resume_job(job_id: int, db: Session = Depends(get_db_session), current_user: Principal = Depends(get_current_user)):
+    job = get_resume_job(db, current_user, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Resume job not found")
+    return job
+
+@router.post("/import")
+async def import_resumes(
+    files: List[UploadFile] = File(...),
+    usernames: List[str] = Form([]),
+    current_user: Principal = Depends(get_current_superuser),
+):
+    """
+    Bulk-import resumes for existing users from a zip archive and/or a list
+    of files. Streams one NDJSON result line per file, then a summary.
+    """
+    try:
+        items = await collect_import_items(files, usernames)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(run_import(items), media_type="application/x-ndjson")
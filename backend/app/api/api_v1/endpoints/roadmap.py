@@ -1,13 +1,25 @@
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db_session, get_current_user
-from app.models.user import User
-from app.schemas.learning_path import LearningPathWithSteps, LearningPathStepUpdate
+from app.schemas.user import Principal
+from app.schemas.learning_path import (
+    LearningPathSummary,
+    LearningPathWithSteps,
+    LearningPathStepUpdate,
+    LearningPathStepBatchUpdate,
+    LearningPathStepBatchResult,
+)
+from app.services.roadmap_compare import compare_paths, latest_path_ids
 from app.services.roadmap_generator import (
     generate_and_persist_learning_path,
+    regenerate_learning_path_incremental,
     get_current_learning_path,
     update_step_progress,
+    update_steps_progress_batch,
     list_learning_paths,
     get_learning_path_by_id,
     restore_learning_path,
@@ -17,21 +29,44 @@ from app.services.roadmap_generator import (
 router = APIRouter()
 
 @router.post("/generate", response_model=LearningPathWithSteps)
-def generate_roadmap(db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
-    lp = generate_and_persist_learning_path(db, current_user)
+def generate_roadmap(
+    incremental: bool = False,
+    db: Session = Depends(get_db_session),
+    current_user: Principal = Depends(get_current_user),
+):
+    try:
+        if incremental:
+            # Update the active path in place, keeping progress on unchanged steps
+            return regenerate_learning_path_incremental(db, current_user)
+        lp = generate_and_persist_learning_path(db, current_user)
+    except IntegrityError:
+        # uq_learning_paths_one_active_per_user: a concurrent generation won
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Another roadmap generation is in progress; retry shortly")
     return lp
 
 @router.get("/current", response_model=LearningPathWithSteps | None)
-def current_roadmap(db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
+def current_roadmap(db: Session = Depends(get_db_session), current_user: Principal = Depends(get_current_user)):
     lp = get_current_learning_path(db, current_user)
     return lp
 
+@router.patch("/steps", response_model=LearningPathStepBatchResult)
+def update_steps_batch(
+    payload: LearningPathStepBatchUpdate,
+    db: Session = Depends(get_db_session),
+    current_user: Principal = Depends(get_current_user),
+):
+    # Apply queued step changes in one transaction; returns a compact delta
+    return update_steps_progress_batch(
+        db, current_user, [u.model_dump() for u in payload.updates]
+    )
+
 @router.patch("/steps/{step_id}", response_model=LearningPathWithSteps)
 def update_step(
     step_id: int,
     payload: LearningPathStepUpdate,
     db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     lp = update_step_progress(
         db,
@@ -42,33 +77,55 @@ def update_step(
     )
     return lp
 
-@router.get("/history")
-def history(db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
-    rows = list_learning_paths(db, current_user)
-    # Return lightweight metadata to keep payload small
-    return [
-        {
-            "id": r.id,
-            "title": r.title,
-            "status": r.status,
-            "created_at": r.created_at,
-            "progress_percentage": r.progress_percentage,
-            "estimated_duration_weeks": r.estimated_duration_weeks,
-        }
-        for r in rows
-    ]
+@router.get("/history", response_model=List[LearningPathSummary])
+def history(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session),
+    current_user: Principal = Depends(get_current_user),
+):
+    # Return lightweight metadata to keep payload small; the next page's
+    # cursor comes back in X-Next-Cursor so the body stays a plain list.
+    # Without limit or cursor the whole history is returned, as before paging.
+    if limit is None and cursor is not None:
+        limit = 50
+    try:
+        rows, next_cursor = list_learning_paths(db, current_user, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
 
 @router.get("/{path_id}")
-def get_path(path_id: int, db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
+def get_path(path_id: int, db: Session = Depends(get_db_session), current_user: Principal = Depends(get_current_user)):
     row = get_learning_path_by_id(db, current_user, path_id)
     return row
 
 @router.post("/{path_id}/restore", response_model=LearningPathWithSteps)
-def restore(path_id: int, db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
+def restore(path_id: int, db: Session = Depends(get_db_session), current_user: Principal = Depends(get_current_user)):
     lp = restore_learning_path(db, current_user, path_id)
     return lp
 
 @router.post("/compare")
-def compare(a_id: int, b_id: int, db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
-    data = compare_learning_paths(db, current_user, a_id, b_id)
+def compare(a_id: int, b_id: int, db: Session = Depends(get_db_session), current_user: Principal = Depends(get_current_user)):
+    try:
+        data = compare_learning_paths(db, current_user, a_id, b_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return data
+
+@router.post("/compare/many")
+def compare_many(
+    ids: List[int] = Query([]),
+    last: Optional[int] = Query(None, ge=2),
+    db: Session = Depends(get_db_session),
+    current_user: Principal = Depends(get_current_user),
+):
+    # Compare explicit ids, or the user's `last` N paths (newest first)
+    path_ids = ids or (latest_path_ids(db, current_user, last) if last else [])
+    try:
+        return compare_paths(db, current_user, path_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -4,27 +4,30 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db_session, get_current_user
 from app.models.user import User
 from app.models.skill import UserSkill
-from app.schemas.user import UserOut, UserUpdate
+from app.schemas.user import Principal, UserOut, UserUpdate
 from app.schemas.skill import UserSkillWithSkill, UserSkillUpdate
+from app.services.principals import invalidate_principal
 from sqlalchemy.orm import joinedload
 
 router = APIRouter()
 
 @router.get("/me", response_model=UserOut)
-def read_users_me(current_user: User = Depends(get_current_user)):
+def read_users_me(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 @router.patch("/me", response_model=UserOut)
-def update_users_me(payload: UserUpdate, db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
+def update_users_me(payload: UserUpdate, db: Session = Depends(get_db_session), current_user: Principal = Depends(get_current_user)):
+    user = db.get(User, current_user.id)
     for field, value in payload.model_dump(exclude_unset=True).items():
-        setattr(current_user, field, value)
-    db.add(current_user)
+        setattr(user, field, value)
+    db.add(user)
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    db.refresh(user)
+    invalidate_principal(user.username)
+    return user
 
 @router.get("/me/skills", response_model=list[UserSkillWithSkill])
-def get_my_skills(db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
+def get_my_skills(db: Session = Depends(get_db_session), current_user: Principal = Depends(get_current_user)):
     rows = (
         db.query(UserSkill)
         .options(joinedload(UserSkill.skill))
@@ -38,7 +41,7 @@ def update_my_skill(
     user_skill_id: int,
     payload: UserSkillUpdate,
     db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     us = (
         db.query(UserSkill)
@@ -59,7 +62,7 @@ def update_my_skill(
 def delete_my_skill(
     user_skill_id: int,
     db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     us = db.query(UserSkill).filter(UserSkill.id == user_skill_id, UserSkill.user_id == current_user.id).first()
     if not us:
@@ -5,7 +5,8 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.security import verify_token
-from app.models.user import User
+from app.schemas.user import Principal
+from app.services.principals import load_principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -15,12 +16,20 @@ def get_db_session() -> Generator:
 def get_current_user(
     db: Session = Depends(get_db_session),
     token: str = Depends(oauth2_scheme),
-) -> User:
+) -> Principal:
     payload = verify_token(token)
     username: str = payload.get("sub")  # username in token subject
     if username is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-    user = db.query(User).filter(User.username == username).first()
+    # Cached snapshot; load the User row explicitly where the ORM object is needed
+    user = load_principal(db, username)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if user.is_active is False:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
     return user
+
+def get_current_superuser(current_user: Principal = Depends(get_current_user)) -> Principal:
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough privileges")
+    return current_user
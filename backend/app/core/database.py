@@ -1,7 +1,8 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+from typing import Any, Dict, List
+from sqlalchemy import create_engine, insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -29,3 +30,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def insert_ignore_conflicts(db, model, rows: List[Dict[str, Any]]) -> None:
+    """
+    Multi-row INSERT that skips rows violating a unique constraint
+    (ON CONFLICT DO NOTHING on PostgreSQL and SQLite).
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        db.execute(insert(model), rows)
+        return
+    db.execute(dialect_insert(model).on_conflict_do_nothing(), rows)
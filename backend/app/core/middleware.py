@@ -0,0 +1,187 @@
+"""
+ASGI middleware for MyOwnGuru
+"""
+import json
+import logging
+import math
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.rate_limit import parse_rate
+from app.core.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject request bodies larger than max_body_size with 413.
+
+    Checked against Content-Length up front and against the bytes actually
+    received while the body streams in, so an oversized upload is cut off
+    before it is fully read or spooled.
+    """
+
+    def __init__(self, app, max_body_size: int, path_limits: dict | None = None) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+        # Exact request paths with their own limit (e.g. bulk imports)
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        max_body_size = self.path_limits.get(scope["path"], self.max_body_size)
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    too_large = int(value) > max_body_size
+                except ValueError:
+                    too_large = False
+                if too_large:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        overflowed = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, overflowed
+            if overflowed:
+                # Stop feeding the app once the limit is hit
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_size:
+                    overflowed = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if overflowed:
+                # Form parsing can swallow _BodyTooLarge and answer 400 itself;
+                # whatever the app sends after an overflow is replaced by the 413
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await self._reject(send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not overflowed:
+                raise
+            if not response_started:
+                await self._reject(send)
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({"detail": "Request body too large"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class RateLimitMiddleware:
+    """
+    Token-bucket rate limiting for selected routes, answered with 429 and
+    Retry-After before the request reaches the router or the database.
+
+    limits maps "METHOD /path" (exact path under prefix) to a rate such
+    as "10/minute". Every request is charged to its client IP's bucket;
+    requests carrying a valid bearer token are also charged to the user's,
+    so neither extra accounts behind one IP nor extra IPs for one account
+    raise the budget. The store decides whether buckets are per process or
+    shared (see app.core.rate_limit).
+    """
+
+    def __init__(self, app, store, limits: dict, prefix: str = "", trust_forwarded: bool = False) -> None:
+        self.app = app
+        self.store = store
+        self.trust_forwarded = trust_forwarded
+        # (method, path) -> (capacity, tokens per second); parsed once so a bad rate fails at startup
+        self.limits = {}
+        for route, rate in limits.items():
+            method, _, path = route.strip().partition(" ")
+            capacity, period = parse_rate(rate)
+            self.limits[(method.upper(), prefix + path.strip())] = (capacity, capacity / period)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = self.limits.get((scope["method"], scope["path"]))
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        capacity, rate = limit
+        retry_after = 0.0
+        for identity in self._identities(scope):
+            key = f"{scope['method']} {scope['path']} {identity}"
+            try:
+                if self.store.blocking:
+                    retry_after = await run_in_threadpool(self.store.take, key, capacity, rate)
+                else:
+                    retry_after = self.store.take(key, capacity, rate)
+            except Exception:
+                # A broken limiter store should not take the API down with it
+                logger.exception("Rate limit store failed; allowing request")
+                retry_after = 0.0
+            if retry_after:
+                # Later buckets are not charged for a rejected request
+                break
+        if retry_after:
+            await self._reject(send, retry_after)
+            return
+        await self.app(scope, receive, send)
+
+    def _identities(self, scope) -> list:
+        headers = dict(scope.get("headers", []))
+        if self.trust_forwarded and b"x-forwarded-for" in headers:
+            identities = ["ip:" + headers[b"x-forwarded-for"].decode("latin-1").split(",")[0].strip()]
+        else:
+            client = scope.get("client")
+            identities = [f"ip:{client[0] if client else 'unknown'}"]
+        auth = headers.get(b"authorization", b"").decode("latin-1")
+        scheme, _, token = auth.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                subject = verify_token(token).get("sub")
+            except Exception:
+                subject = None
+            if subject:
+                identities.append(f"user:{subject}")
+        return identities
+
+    async def _reject(self, send, retry_after: float) -> None:
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,109 @@
+"""
+Token-bucket stores for RateLimitMiddleware.
+
+A bucket holds up to `capacity` tokens and refills at `rate` tokens per
+second; each request takes one. take() returns 0 when the request may
+proceed, otherwise the seconds until a token is available (for
+Retry-After). The in-memory store is per process; the SQLite store keeps
+buckets in a local database file so every worker on the host shares them.
+"""
+from __future__ import annotations
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+_RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day|s|m|h|d)?\s*$")
+_UNIT_SECONDS = {"second": 1, "s": 1, "minute": 60, "m": 60, "hour": 3600, "h": 3600, "day": 86400, "d": 86400}
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """Parse "10/minute", "100/hour" or "5/30s" into (capacity, period_seconds)."""
+    m = _RATE_RE.match(rate)
+    if not m or int(m.group(1)) <= 0 or not (m.group(2) or m.group(3)):
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+    count = int(m.group(2) or 1)
+    return int(m.group(1)), float(count * _UNIT_SECONDS[m.group(3) or "s"])
+
+
+def _refill(tokens: float, updated: float, now: float, capacity: int, rate: float) -> float:
+    return min(float(capacity), tokens + max(0.0, now - updated) * rate)
+
+
+class MemoryBucketStore:
+    """Buckets in a dict, least recently used dropped beyond max_keys."""
+
+    blocking = False
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(capacity), now))
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class SqliteBucketStore:
+    """Buckets in a SQLite file shared by all worker processes on the host."""
+
+    blocking = True
+    _PRUNE_EVERY = 1000
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._calls = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        # Wall clock, since monotonic clocks are not comparable across processes
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = _refill(row[0], row[1], now, capacity, rate) if row else float(capacity)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            self._calls += 1
+            if self._calls % self._PRUNE_EVERY == 0:
+                # Idle for a day means the bucket is full again; no need to keep it
+                conn.execute("DELETE FROM buckets WHERE updated < ?", (now - 86400,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
@@ -1,15 +1,34 @@
 """
 Security utilities for authentication and authorization
 """
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.utils.cache import TTLCache
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context. Hashes below the configured cost are flagged
+# by needs_update() and upgraded on the next successful login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    # Hashes at any other cost need an update, so BCRYPT_ROUNDS can be tuned
+    # down as well as up and stored hashes follow on the next login
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Payloads of tokens whose signature already checked out, keyed by token
+# digest; each entry expires at the token's own exp claim
+_VERIFIED_TOKENS = TTLCache("verified_tokens", maxsize=settings.JWT_CACHE_SIZE, ttl=0)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
@@ -29,8 +48,16 @@ def verify_token(token: str) -> dict:
     """
     Verify JWT token and return payload
     """
+    key = hashlib.sha256(token.encode()).digest()
+    cached = _VERIFIED_TOKENS.get(key)
+    if cached is not None:
+        return dict(cached)
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        exp = payload.get("exp")
+        # Tokens without exp are not cached, so expiry is always enforced
+        if isinstance(exp, (int, float)) and exp > time.time():
+            _VERIFIED_TOKENS.set(key, dict(payload), ttl=exp - time.time())
         return payload
     except JWTError:
         raise HTTPException(
@@ -51,6 +78,68 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+class HashingSaturated(Exception):
+    """Raised when too many password hashes are already queued."""
+
+
+# bcrypt releases the GIL, so a small thread pool of its own keeps login
+# storms from occupying the threadpool that sync endpoints share
+_HASH_EXECUTOR: ThreadPoolExecutor | None = None
+_HASH_LOCK = threading.Lock()
+_HASH_PENDING = 0
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _HASH_EXECUTOR
+    with _HASH_LOCK:
+        if _HASH_EXECUTOR is None:
+            _HASH_EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, settings.PASSWORD_HASH_WORKERS), thread_name_prefix="pwhash"
+            )
+        return _HASH_EXECUTOR
+
+
+def _release_hash_slot(_: object = None) -> None:
+    global _HASH_PENDING
+    with _HASH_LOCK:
+        _HASH_PENDING -= 1
+
+
+async def _run_in_hash_pool(fn, *args):
+    global _HASH_PENDING
+    with _HASH_LOCK:
+        if _HASH_PENDING >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise HashingSaturated("Password hashing queue is full")
+        _HASH_PENDING += 1
+    try:
+        fut = asyncio.get_running_loop().run_in_executor(_get_hash_executor(), fn, *args)
+    except Exception:
+        _release_hash_slot()
+        raise
+    fut.add_done_callback(_release_hash_slot)
+    return await fut
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password off the event loop. Returns (valid, new_hash); new_hash
+    is set when the stored hash uses outdated parameters and should be replaced.
+    """
+    return await _run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password off the event loop."""
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+
+def shutdown_hashing_pool() -> None:
+    global _HASH_EXECUTOR
+    with _HASH_LOCK:
+        executor, _HASH_EXECUTOR = _HASH_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
 def create_password_reset_token(email: str) -> str:
     """
     Create password reset token
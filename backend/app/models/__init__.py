@@ -4,9 +4,11 @@ Database models for MyOwnGuru
 from app.core.database import Base
 from .user import User
 from .skill import Skill, UserSkill
-from .learning_path import LearningPath, LearningPathStep
+from .learning_path import LearningPath, LearningPathStep, LearningPathArchive
 from .content import Content, ContentRecommendation
 from .progress import Progress, Feedback
+from .resume_job import ResumeJob
+from .refresh_token import RefreshToken
 
 __all__ = [
     "Base",
@@ -15,8 +17,11 @@ __all__ = [
     "UserSkill", 
     "LearningPath",
     "LearningPathStep",
+    "LearningPathArchive",
     "Content",
     "ContentRecommendation",
     "Progress",
-    "Feedback"
+    "Feedback",
+    "ResumeJob",
+    "RefreshToken"
 ]
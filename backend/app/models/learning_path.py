@@ -1,7 +1,8 @@
 """
 Learning path models for personalized learning roadmaps
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, JSON
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, JSON, Index, LargeBinary
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -36,8 +37,10 @@ class LearningPath(Base):
     career_alignment_score = Column(Float)
     business_relevance_score = Column(Float)
     
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Timestamps. created_at is set client-side so SQLite stores every row in
+    # one text format (CURRENT_TIMESTAMP has no fraction) and the history
+    # index can be compared on the raw column
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
@@ -50,6 +53,23 @@ class LearningPath(Base):
     def __repr__(self):
         return f"<LearningPath(id={self.id}, title='{self.title}', user_id={self.user_id})>"
 
+# Serves /roadmap/history keyset pages: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+Index(
+    "ix_learning_paths_user_id_created_at",
+    LearningPath.user_id,
+    LearningPath.created_at.desc(),
+    LearningPath.id.desc(),
+)
+
+# At most one active path per user; also serves the active-path lookups
+Index(
+    "uq_learning_paths_one_active_per_user",
+    LearningPath.user_id,
+    unique=True,
+    postgresql_where=LearningPath.status == "active",
+    sqlite_where=LearningPath.status == "active",
+)
+
 class LearningPathStep(Base):
     __tablename__ = "learning_path_steps"
     
@@ -96,3 +116,39 @@ class LearningPathStep(Base):
     
     def __repr__(self):
         return f"<LearningPathStep(id={self.id}, title='{self.title}', step_number={self.step_number})>"
+
+# Steps of a path in display order: joinedload(LearningPath.steps), progress aggregates, compare
+Index(
+    "ix_learning_path_steps_learning_path_id_step_number",
+    LearningPathStep.learning_path_id,
+    LearningPathStep.step_number,
+)
+
+class LearningPathArchive(Base):
+    """Cold-storage copy of an archived path and its steps, one row per path."""
+    __tablename__ = "learning_path_archives"
+    
+    # Same id the path had in learning_paths, so links and history keep working
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # Summary columns, kept uncompressed for /roadmap/history
+    title = Column(String, nullable=False)
+    status = Column(String, default="archived")
+    progress_percentage = Column(Float, default=0.0)
+    estimated_duration_weeks = Column(Integer)
+    created_at = Column(DateTime(timezone=True))
+    
+    # zlib-compressed JSON: {"path": {...columns}, "steps": [{...columns}, ...]}
+    payload = Column(LargeBinary, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<LearningPathArchive(id={self.id}, title='{self.title}', user_id={self.user_id})>"
+
+Index(
+    "ix_learning_path_archives_user_id_created_at",
+    LearningPathArchive.user_id,
+    LearningPathArchive.created_at.desc(),
+    LearningPathArchive.id.desc(),
+)
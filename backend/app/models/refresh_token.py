@@ -0,0 +1,28 @@
+"""
+Refresh token model for renewing access tokens without a password check
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    
+    # SHA-256 of the opaque token; the token itself is never stored
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
+    # Tokens descended from one login share a family, revoked together on reuse
+    family_id = Column(String(32), nullable=False, index=True)
+    
+    # Lifecycle
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True))
+    replaced_by_id = Column(Integer, ForeignKey("refresh_tokens.id"))
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family_id='{self.family_id}')>"
@@ -0,0 +1,33 @@
+"""
+Resume processing job model for the background ingestion queue
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class ResumeJob(Base):
+    __tablename__ = "resume_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    
+    # Uploaded document, spooled to disk until the job finishes
+    filename = Column(String)
+    file_path = Column(String, nullable=False)
+    file_kind = Column(String, nullable=False)  # sniffed type as a suffix: .pdf, .docx, .doc, .txt
+    file_digest = Column(String, nullable=False)  # SHA-256 of the upload
+    
+    # Processing state
+    status = Column(String, default="queued", index=True)  # queued, running, completed, failed
+    attempts = Column(Integer, default=0)  # also identifies the current claim
+    not_before = Column(DateTime(timezone=True))  # retried jobs wait out a backoff before being claimed again
+    error = Column(Text)
+    result = Column(JSON)  # list of UserSkillOut dicts
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    
+    def __repr__(self):
+        return f"<ResumeJob(id={self.id}, user_id={self.user_id}, status='{self.status}')>"
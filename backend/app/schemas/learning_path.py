@@ -1,5 +1,6 @@
 from typing import Optional, List, Any
-from pydantic import BaseModel
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
 
 class LearningPathStepBase(BaseModel):
     title: str
@@ -14,6 +15,8 @@ class LearningPathStepBase(BaseModel):
 
 class LearningPathStepOut(LearningPathStepBase):
     id: int
+    status: Optional[str] = None
+    progress_percentage: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -22,6 +25,27 @@ class LearningPathStepUpdate(BaseModel):
     status: Optional[str] = None  # not_started, in_progress, completed, skipped
     progress_percentage: Optional[float] = None
 
+class LearningPathStepBatchItem(LearningPathStepUpdate):
+    step_id: int
+
+class LearningPathStepBatchUpdate(BaseModel):
+    updates: List[LearningPathStepBatchItem] = Field(max_length=500)
+
+class StepProgressOut(BaseModel):
+    id: int
+    learning_path_id: int
+    status: Optional[str] = None
+    progress_percentage: Optional[float] = None
+
+class PathProgressOut(BaseModel):
+    id: int
+    progress_percentage: float
+
+class LearningPathStepBatchResult(BaseModel):
+    steps: List[StepProgressOut] = []
+    paths: List[PathProgressOut] = []
+    not_found: List[int] = []
+
 class LearningPathBase(BaseModel):
     title: str
     description: Optional[str] = None
@@ -37,8 +61,24 @@ class LearningPathOut(LearningPathBase):
     class Config:
         from_attributes = True
 
+class LearningPathSummary(BaseModel):
+    id: int
+    title: str
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    progress_percentage: Optional[float] = None
+    estimated_duration_weeks: Optional[int] = None
+
 class LearningPathWithSteps(LearningPathOut):
     steps: List[LearningPathStepOut] = []
 
+    @field_validator("steps", mode="before")
+    @classmethod
+    def _drop_retired_steps(cls, v):
+        # Steps retired by incremental regeneration are kept only for history
+        if v is None:
+            return []
+        return [s for s in v if (s.get("status") if isinstance(s, dict) else getattr(s, "status", None)) != "retired"]
+
     class Config:
         from_attributes = True
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional, List
+from pydantic import BaseModel
+
+from app.schemas.skill import UserSkillOut
+
+class ResumeJobCreated(BaseModel):
+    id: int
+    status: str
+
+class ResumeJobOut(BaseModel):
+    id: int
+    status: str
+    filename: Optional[str] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    skills: List[UserSkillOut] = []
@@ -40,3 +40,10 @@ class UserOut(UserBase):
 
     class Config:
         from_attributes = True
+
+class Principal(UserOut):
+    """Immutable snapshot of the authenticated user, cached between requests."""
+
+    class Config:
+        from_attributes = True
+        frozen = True
@@ -0,0 +1,87 @@
+"""
+Curated learning content catalog, indexed by (skill, content type).
+
+curated_content.json maps skill names to lists of items. It is loaded
+once into a CuratedCatalog whose index is keyed by normalized skill name
+and content type, so lookups are a dict access regardless of catalog
+size. Each key holds its candidates already ranked. reload_catalog()
+builds a fresh catalog and swaps it in by reference, so readers never
+see a half-built index.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+CURATED_PATH = Path(__file__).resolve().parent.parent / "data" / "curated_content.json"
+
+
+def normalize_skill(name: str) -> str:
+    return " ".join((name or "").lower().split())
+
+
+def _rank_key(position: int, item: Dict[str, Any]) -> Tuple[float, int]:
+    # Higher rating first; catalog order breaks ties
+    try:
+        rating = float(item.get("rating") or 0.0)
+    except (TypeError, ValueError):
+        rating = 0.0
+    return (-rating, position)
+
+
+class CuratedCatalog:
+    """Immutable ranked index over the curated content catalog."""
+
+    def __init__(self, version: str, data: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.version = version
+        by_type: Dict[Tuple[str, str], List[Tuple[Tuple[float, int], Dict[str, Any]]]] = {}
+        by_skill: Dict[str, List[Tuple[Tuple[float, int], Dict[str, Any]]]] = {}
+        position = 0
+        for skill_name, items in data.items():
+            skill = normalize_skill(skill_name)
+            for item in items or []:
+                key = _rank_key(position, item)
+                position += 1
+                by_skill.setdefault(skill, []).append((key, item))
+                by_type.setdefault((skill, (item.get("type") or "").lower()), []).append((key, item))
+        self._by_type = {k: [it for _, it in sorted(v, key=lambda e: e[0])] for k, v in by_type.items()}
+        self._by_skill = {k: [it for _, it in sorted(v, key=lambda e: e[0])] for k, v in by_skill.items()}
+        self.size = position
+
+    def candidates(self, skill_name: str, type_hint: str | None = None) -> List[Dict[str, Any]]:
+        """Ranked items for a skill, restricted to type_hint when given."""
+        skill = normalize_skill(skill_name)
+        if type_hint is None:
+            return self._by_skill.get(skill, [])
+        return self._by_type.get((skill, type_hint.lower()), [])
+
+    def pick(self, skill_name: str, type_hint: str) -> Dict[str, Any]:
+        """Best item of the hinted type, else the best item for the skill, else {}."""
+        items = self.candidates(skill_name, type_hint) or self.candidates(skill_name)
+        return items[0] if items else {}
+
+
+_CATALOG: CuratedCatalog | None = None
+_CATALOG_LOCK = threading.Lock()
+
+
+def _load_catalog() -> CuratedCatalog:
+    raw = CURATED_PATH.read_bytes() if CURATED_PATH.exists() else b"{}"
+    return CuratedCatalog(hashlib.sha256(raw).hexdigest()[:16], json.loads(raw))
+
+
+def reload_catalog() -> CuratedCatalog:
+    """Rebuild the index from disk and atomically swap it in."""
+    global _CATALOG
+    with _CATALOG_LOCK:
+        _CATALOG = _load_catalog()
+    return _CATALOG
+
+
+def get_catalog() -> CuratedCatalog:
+    catalog = _CATALOG
+    if catalog is None:
+        catalog = reload_catalog()
+    return catalog
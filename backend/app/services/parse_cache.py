@@ -0,0 +1,136 @@
+"""
+On-disk cache of extracted resume text and matched skills.
+
+Entries are keyed by the SHA-256 of the uploaded bytes, the file suffix,
+the taxonomy version and the extraction settings (PDF page/character
+budget, streaming), so a repeat upload of the same document skips
+PyPDF2/python-docx entirely while a taxonomy or budget change invalidates
+old results. Each entry is one JSON file; file mtime doubles as the LRU clock.
+Writes keep a running estimate of the directory size, and once it passes
+PARSE_CACHE_MAX_BYTES a background thread trims the least recently used
+entries and resets the estimate from a fresh scan.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(settings.PARSE_CACHE_DIR)
+
+# Bytes in CACHE_DIR as of the last scan plus what this process wrote since;
+# None until the first scan. Other workers' writes are picked up by the next scan.
+_approx_bytes: Optional[int] = None
+_evicting = False
+_lock = threading.Lock()
+
+
+def _extractor_config(suffix: str) -> str:
+    # Settings that change what text is extracted; PDFs may be truncated to a budget
+    if suffix == ".pdf":
+        return f"stream={settings.PDF_STREAMING}:pages={settings.PDF_MAX_PAGES}:chars={settings.PDF_MAX_CHARS}"
+    return ""
+
+
+def _entry_path(digest: str, suffix: str, taxonomy_version: str) -> Path:
+    raw = f"{digest}:{suffix}:{taxonomy_version}:{_extractor_config(suffix)}"
+    key = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def get(digest: str, suffix: str, taxonomy_version: str) -> Optional[Tuple[str, List[Tuple[str, str, str]]]]:
+    """Return (text, skills) for a cached document, or None on a miss."""
+    if not settings.PARSE_CACHE_ENABLED:
+        return None
+    path = _entry_path(digest, suffix, taxonomy_version)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        result = entry["text"], [tuple(s) for s in entry["skills"]]
+        os.utime(path)  # mark as recently used
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Dropping unreadable parse cache entry {path.name}: {e}")
+        path.unlink(missing_ok=True)
+        return None
+    return result
+
+
+def put(digest: str, suffix: str, taxonomy_version: str, text: str, skills: List[Tuple[str, str, str]]) -> None:
+    global _approx_bytes
+    if not settings.PARSE_CACHE_ENABLED:
+        return
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _entry_path(digest, suffix, taxonomy_version)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        data = json.dumps({"text": text, "skills": [list(s) for s in skills]}).encode("utf-8")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        # The cache is an optimisation; never fail an upload because of it
+        logger.warning(f"Could not write parse cache entry: {e}")
+        return
+    with _lock:
+        if _approx_bytes is not None:
+            _approx_bytes += len(data)
+        if _approx_bytes is not None and _approx_bytes <= settings.PARSE_CACHE_MAX_BYTES:
+            return
+    _schedule_evict()
+
+
+def _schedule_evict() -> None:
+    global _evicting
+    with _lock:
+        if _evicting:
+            return
+        _evicting = True
+    threading.Thread(target=_run_evict, name="parse-cache-evict", daemon=True).start()
+
+
+def _run_evict() -> None:
+    global _approx_bytes, _evicting
+    try:
+        total = _evict()
+        with _lock:
+            _approx_bytes = total
+    except OSError as e:
+        logger.warning(f"Parse cache eviction failed: {e}")
+    finally:
+        with _lock:
+            _evicting = False
+
+
+def _evict() -> int:
+    """Trim CACHE_DIR to PARSE_CACHE_MAX_BYTES, least recently used first; returns the bytes left."""
+    entries = []
+    total = 0
+    for de in os.scandir(CACHE_DIR):
+        if not de.name.endswith(".json"):
+            continue
+        try:
+            st = de.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, de.path))
+        total += st.st_size
+    if total <= settings.PARSE_CACHE_MAX_BYTES:
+        return total
+    # Least recently used first
+    entries.sort()
+    for _, size, path in entries:
+        if total <= settings.PARSE_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    return total
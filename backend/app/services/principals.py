@@ -0,0 +1,39 @@
+"""
+Cache of authenticated users, so most requests skip the users lookup.
+
+get_current_user resolves the token subject to a Principal: a frozen
+snapshot of the profile fields (no password hash, resume text or ORM
+state), held for PRINCIPAL_CACHE_TTL_SECONDS. Code that changes a user
+calls invalidate_principal(); other workers pick the change up when their
+entry expires.
+"""
+from __future__ import annotations
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.user import Principal
+from app.utils.cache import TTLCache
+
+_PRINCIPALS = TTLCache(
+    "principals",
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def load_principal(db: Session, username: str) -> Optional[Principal]:
+    principal = _PRINCIPALS.get(username)
+    if principal is None:
+        user = db.query(User).filter(User.username == username).first()
+        if user is None:
+            return None
+        principal = Principal.model_validate(user)
+        _PRINCIPALS.set(username, principal)
+    return principal
+
+
+def invalidate_principal(username: str) -> None:
+    _PRINCIPALS.invalidate(username)
@@ -1,8 +1,8 @@
 from typing import List
 from app.schemas.content import ContentRecommendationOut
-from app.models.user import User
+from app.schemas.user import Principal
 
-async def get_recommendations(user: User) -> List[ContentRecommendationOut]:
+async def get_recommendations(user: Principal) -> List[ContentRecommendationOut]:
     # TODO: implement real recommender using content aggregation and skill gaps
     return [
         ContentRecommendationOut(id=1, user_id=user.id, content_id=1001, recommendation_score=92.5, recommendation_reason="Matches your target skill: Data Engineering"),
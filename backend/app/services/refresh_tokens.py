@@ -0,0 +1,139 @@
+"""
+Long-lived refresh tokens, stored hashed and rotated on every use.
+
+A refresh token is an opaque random string; only its SHA-256 is kept, so
+renewing an access token is one indexed lookup instead of a bcrypt check.
+Each use revokes the presented token and issues a successor in the same
+family. Presenting an already-rotated token means it leaked (or a client
+replayed it), so the whole family is revoked and the user must log in.
+
+Rotated tokens are kept until they expire so reuse is still detected.
+prune_refresh_tokens() deletes expired rows and families with no live
+token left; logins prune the user's own rows, and
+``python -m app.services.refresh_tokens`` sweeps every user (run it
+periodically for users who stop logging in).
+"""
+from __future__ import annotations
+import hashlib
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidRefreshToken(Exception):
+    """Raised when a refresh token is unknown, expired, revoked or reused."""
+
+
+def _hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes even for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _new_token(db: Session, user_id: int, family_id: str) -> Tuple[RefreshToken, str]:
+    token = secrets.token_urlsafe(32)
+    row = RefreshToken(
+        user_id=user_id,
+        token_hash=_hash(token),
+        family_id=family_id,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    db.add(row)
+    db.flush()
+    return row, token
+
+
+def _prune(db: Session, user_id: Optional[int]) -> int:
+    now = datetime.now(timezone.utc)
+    live_families = select(RefreshToken.family_id).where(
+        RefreshToken.revoked_at.is_(None), RefreshToken.expires_at > now
+    )
+    if user_id is not None:
+        # Scope the subquery too, so a login only reads the user's own tokens
+        live_families = live_families.where(RefreshToken.user_id == user_id)
+    stmt = delete(RefreshToken).where(
+        or_(RefreshToken.expires_at <= now, RefreshToken.family_id.not_in(live_families))
+    )
+    if user_id is not None:
+        stmt = stmt.where(RefreshToken.user_id == user_id)
+    return db.execute(stmt, execution_options={"synchronize_session": False}).rowcount
+
+
+def prune_refresh_tokens(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Delete expired tokens and every token of a family with no live member
+    (all revoked or expired), for one user or for everyone; commits and
+    returns how many rows were deleted.
+    """
+    deleted = _prune(db, user_id)
+    db.commit()
+    return deleted
+
+
+def issue_refresh_token(db: Session, user: User) -> str:
+    """Start a new token family for a fresh login, pruning the user's dead tokens; commits."""
+    _prune(db, user.id)
+    _, token = _new_token(db, user.id, secrets.token_hex(16))
+    db.commit()
+    return token
+
+
+def rotate_refresh_token(db: Session, token: str) -> Tuple[User, str]:
+    """Exchange a refresh token for its successor; returns (user, new token) and commits."""
+    row = db.query(RefreshToken).filter(RefreshToken.token_hash == _hash(token)).first()
+    if row is None:
+        raise InvalidRefreshToken("Unknown refresh token")
+    now = datetime.now(timezone.utc)
+    if row.revoked_at is not None:
+        # Reuse of a rotated token: cut off every token descended from that login
+        db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == row.family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        db.commit()
+        raise InvalidRefreshToken("Refresh token was already used")
+    if _as_utc(row.expires_at) <= now:
+        raise InvalidRefreshToken("Refresh token expired")
+
+    user = db.get(User, row.user_id)
+    if user is None or user.is_active is False:
+        raise InvalidRefreshToken("User is not active")
+
+    # Claim the token; a concurrent refresh with the same token loses here
+    claimed = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == row.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        raise InvalidRefreshToken("Refresh token was already used")
+    successor, new_token = _new_token(db, row.user_id, row.family_id)
+    db.execute(update(RefreshToken).where(RefreshToken.id == row.id).values(replaced_by_id=successor.id))
+    db.commit()
+    return user, new_token
+
+
+if __name__ == "__main__":
+    from app.core.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        logger.info(f"Pruned {prune_refresh_tokens(db)} refresh tokens")
+    finally:
+        db.close()
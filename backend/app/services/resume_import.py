@@ -0,0 +1,235 @@
+"""
+Bulk resume import for organization onboarding.
+
+Resumes arrive as a zip archive and/or a multipart list of files, each
+mapped to an existing username. Parsing fans out over the extraction
+pool and UserSkill rows are written IMPORT_BATCH_SIZE files per
+transaction. Results are reported as newline-delimited JSON, one line per
+file as soon as its batch is committed, followed by a summary line.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import zipfile
+from pathlib import PurePosixPath
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.resume_parser import bulk_upsert_user_skills, extract_resume_skills
+from app.services.text_extraction import ExtractionSaturated
+from app.utils.file_utils import SpooledUpload, UnsupportedFileType, UploadTooLarge, spool_fileobj, spool_upload
+
+logger = logging.getLogger(__name__)
+
+
+class ImportItem:
+    """One resume in an import, tracked from spooling to persistence."""
+
+    def __init__(self, filename: str, username: str) -> None:
+        self.filename = filename
+        self.username = username
+        self.upload: Optional[SpooledUpload] = None
+        self.user_id: Optional[int] = None
+        self.triples: List[Tuple[str, str, str]] = []
+        self.error: Optional[str] = None
+
+    def cleanup(self) -> None:
+        if self.upload is not None:
+            self.upload.cleanup()
+            self.upload = None
+
+    def report(self) -> str:
+        line = {"file": self.filename, "username": self.username}
+        if self.error:
+            line.update({"status": "error", "error": self.error})
+        else:
+            line.update({"status": "ok", "skills": [name for name, _, _ in self.triples]})
+        return json.dumps(line) + "\n"
+
+
+def _username_for_member(member: str) -> str:
+    # "alice/resume.pdf" -> "alice"; "alice.pdf" -> "alice"
+    parts = PurePosixPath(member).parts
+    return parts[0] if len(parts) > 1 else PurePosixPath(member).stem
+
+
+def _too_many_files() -> ValueError:
+    return ValueError(f"Import is limited to {settings.MAX_IMPORT_FILES} files")
+
+
+def _spool_archive(fileobj, archive_name: str, max_files: int) -> List[ImportItem]:
+    """
+    Spool the resumes inside a zip. The member count and declared sizes are
+    checked against max_files and MAX_IMPORT_SIZE before anything is
+    decompressed, so an oversized archive is refused without unpacking it;
+    the bytes actually spooled are checked again as members are read, since
+    declared sizes can lie.
+    """
+    items: List[ImportItem] = []
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        item = ImportItem(archive_name, "")
+        item.error = "Not a valid zip archive"
+        return [item]
+    with archive:
+        members = [
+            info for info in archive.infolist()
+            if not (info.is_dir() or info.filename.startswith("__MACOSX/") or PurePosixPath(info.filename).name.startswith("."))
+        ]
+        if len(members) > max_files:
+            raise _too_many_files()
+        # Oversized members are reported without being read, so they do not count
+        unpacked = sum(info.file_size for info in members if info.file_size <= settings.MAX_FILE_SIZE)
+        if unpacked > settings.MAX_IMPORT_SIZE:
+            raise ValueError(f"Archive {archive_name} unpacks to more than {settings.MAX_IMPORT_SIZE} bytes")
+        spooled = 0
+        try:
+            for info in members:
+                name = info.filename
+                item = ImportItem(name, _username_for_member(name))
+                items.append(item)
+                if info.file_size > settings.MAX_FILE_SIZE:
+                    item.error = f"File exceeds {settings.MAX_FILE_SIZE} bytes"
+                    continue
+                try:
+                    with archive.open(info) as member:
+                        # spool_fileobj re-checks the size on the decompressed bytes
+                        item.upload = spool_fileobj(member, name)
+                    spooled += item.upload.size
+                except (UploadTooLarge, UnsupportedFileType) as e:
+                    item.error = str(e)
+                except Exception as e:
+                    item.error = f"Could not read archive member: {e}"
+                if spooled > settings.MAX_IMPORT_SIZE:
+                    raise ValueError(f"Archive {archive_name} unpacks to more than {settings.MAX_IMPORT_SIZE} bytes")
+        except BaseException:
+            for item in items:
+                item.cleanup()
+            raise
+    return items
+
+
+async def collect_import_items(files: List[UploadFile], usernames: Optional[List[str]] = None) -> List[ImportItem]:
+    """
+    Spool every resume to disk before the response starts streaming.
+    usernames, when given, maps positionally to files; otherwise the
+    filename stem (or the top-level folder inside a zip) is the username.
+    """
+    items: List[ImportItem] = []
+    try:
+        for i, file in enumerate(files):
+            filename = file.filename or f"file-{i}"
+            if filename.lower().endswith(".zip"):
+                remaining = settings.MAX_IMPORT_FILES - len(items)
+                items.extend(await run_in_threadpool(_spool_archive, file.file, filename, remaining))
+                continue
+            if len(items) >= settings.MAX_IMPORT_FILES:
+                raise _too_many_files()
+            username = usernames[i] if usernames and i < len(usernames) else PurePosixPath(filename).stem
+            item = ImportItem(filename, username)
+            items.append(item)
+            try:
+                item.upload = await spool_upload(file)
+            except (UploadTooLarge, UnsupportedFileType) as e:
+                item.error = str(e)
+    except BaseException:
+        for item in items:
+            item.cleanup()
+        raise
+    return items
+
+
+async def _parse(item: ImportItem, slots: asyncio.Semaphore) -> ImportItem:
+    async with slots:
+        try:
+            for attempt in range(3):
+                try:
+                    item.triples = await extract_resume_skills(item.upload.path, item.upload.kind, item.upload.digest)
+                    break
+                except ExtractionSaturated:
+                    # Interactive uploads share the pool; back off rather than fail
+                    if attempt == 2:
+                        raise
+                    await asyncio.sleep(1.0 + attempt)
+        except Exception as e:
+            item.error = f"Extraction failed: {e.__class__.__name__}"
+        finally:
+            item.cleanup()
+    return item
+
+
+def _persist_batch(db, batch: List[ImportItem]) -> None:
+    by_user: Dict[int, List[Tuple[str, str, str]]] = {}
+    for item in batch:
+        by_user.setdefault(item.user_id, []).extend(item.triples)
+    for uid, triples in by_user.items():
+        # The same user may appear in several files of one batch
+        by_user[uid] = list(dict.fromkeys(triples))
+    try:
+        bulk_upsert_user_skills(db, by_user)
+    except Exception as e:
+        db.rollback()
+        logger.exception("Resume import batch failed")
+        for item in batch:
+            item.error = f"Could not save skills: {e.__class__.__name__}"
+
+
+async def run_import(items: List[ImportItem]) -> AsyncIterator[str]:
+    """Parse and persist spooled items, yielding one NDJSON report line per file."""
+    db = SessionLocal()
+    tasks: List[asyncio.Future] = []
+    ok = failed = 0
+    try:
+        usernames = {item.username for item in items if not item.error}
+        user_ids = {
+            username: uid
+            for username, uid in db.query(User.username, User.id).filter(User.username.in_(usernames)).all()
+        } if usernames else {}
+
+        runnable: List[ImportItem] = []
+        for item in items:
+            if not item.error:
+                item.user_id = user_ids.get(item.username)
+                if item.user_id is None:
+                    item.error = f"Unknown username: {item.username}"
+            if item.error:
+                item.cleanup()
+                failed += 1
+                yield item.report()
+            else:
+                runnable.append(item)
+
+        slots = asyncio.Semaphore(max(1, settings.EXTRACTION_MAX_WORKERS))
+        tasks = [asyncio.ensure_future(_parse(item, slots)) for item in runnable]
+        batch: List[ImportItem] = []
+        for i, next_done in enumerate(asyncio.as_completed(tasks)):
+            item = await next_done
+            if not item.error:
+                batch.append(item)
+            else:
+                failed += 1
+                yield item.report()
+            if batch and (len(batch) >= settings.IMPORT_BATCH_SIZE or i == len(tasks) - 1):
+                await run_in_threadpool(_persist_batch, db, batch)
+                for done in batch:
+                    if done.error:
+                        failed += 1
+                    else:
+                        ok += 1
+                    yield done.report()
+                batch = []
+
+        yield json.dumps({"summary": {"files": len(items), "ok": ok, "failed": failed}}) + "\n"
+    finally:
+        for task in tasks:
+            task.cancel()
+        for item in items:
+            item.cleanup()
+        db.close()
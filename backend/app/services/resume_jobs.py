@@ -0,0 +1,231 @@
+"""
+Database-backed queue for background resume processing.
+
+POST /resume/jobs spools the upload and enqueues a ResumeJob row; one or
+more workers (``python -m app.services.resume_jobs``) claim queued jobs,
+extract skills and persist them, so ingestion throughput scales
+independently of API workers. On PostgreSQL jobs are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED; other backends use an optimistic
+conditional UPDATE.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.models.resume_job import ResumeJob
+from app.schemas.user import Principal
+from app.schemas.resume_job import ResumeJobOut
+from app.services.resume_parser import extract_resume_skills, upsert_user_skills
+from app.utils.file_utils import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+# How often a worker looks for abandoned jobs that have no attempts left
+_SWEEP_INTERVAL_SECONDS = 60
+
+
+def enqueue_resume_job(db: Session, user: Principal, upload: SpooledUpload, filename: Optional[str]) -> ResumeJob:
+    """Record a spooled upload as a queued job; the worker owns the file from here on."""
+    job = ResumeJob(
+        user_id=user.id,
+        filename=filename,
+        file_path=upload.path,
+        file_kind=upload.kind,
+        file_digest=upload.digest,
+        status="queued",
+        attempts=0,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_resume_job(db: Session, user: Principal, job_id: int) -> ResumeJobOut | None:
+    job = db.query(ResumeJob).filter(ResumeJob.id == job_id, ResumeJob.user_id == user.id).first()
+    if not job:
+        return None
+    return ResumeJobOut(
+        id=job.id,
+        status=job.status,
+        filename=job.filename,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        skills=job.result or [],
+    )
+
+
+def _stale_running():
+    # Running jobs whose worker appears to have died
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.RESUME_JOB_STALE_SECONDS)
+    return and_(ResumeJob.status == "running", ResumeJob.started_at < stale_before)
+
+
+def _claimable():
+    now = datetime.now(timezone.utc)
+    return and_(
+        or_(
+            and_(ResumeJob.status == "queued", or_(ResumeJob.not_before.is_(None), ResumeJob.not_before <= now)),
+            _stale_running(),
+        ),
+        ResumeJob.attempts < settings.RESUME_JOB_MAX_ATTEMPTS,
+    )
+
+
+def _remove_upload(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def fail_exhausted_jobs(db: Session) -> int:
+    """
+    Mark stale running jobs that already used their last attempt as failed
+    and delete their spooled uploads; _claimable() never picks these up.
+    Returns how many jobs were failed.
+    """
+    exhausted = and_(_stale_running(), ResumeJob.attempts >= settings.RESUME_JOB_MAX_ATTEMPTS)
+    jobs = db.query(ResumeJob.id, ResumeJob.file_path).filter(exhausted).all()
+    failed = 0
+    for job_id, file_path in jobs:
+        # Conditional, so a worker that finishes the job meanwhile keeps its result
+        updated = (
+            db.query(ResumeJob)
+            .filter(ResumeJob.id == job_id, exhausted)
+            .update(
+                {
+                    ResumeJob.status: "failed",
+                    ResumeJob.error: "Worker stopped responding on the final attempt",
+                    ResumeJob.finished_at: func.now(),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if updated:
+            failed += 1
+            _remove_upload(file_path)
+    return failed
+
+
+def claim_next_job(db: Session) -> ResumeJob | None:
+    """Atomically move the oldest claimable job to running and return it."""
+    query = db.query(ResumeJob).filter(_claimable()).order_by(ResumeJob.id)
+    if db.get_bind().dialect.name == "postgresql":
+        job = query.with_for_update(skip_locked=True).first()
+        if job is None:
+            db.rollback()
+            return None
+        job.status = "running"
+        job.started_at = func.now()
+        job.attempts = (job.attempts or 0) + 1
+        db.commit()
+        db.refresh(job)
+        return job
+
+    # No row locks: whichever worker's conditional UPDATE lands first wins
+    claim = {
+        ResumeJob.status: "running",
+        ResumeJob.started_at: func.now(),
+        ResumeJob.attempts: ResumeJob.attempts + 1,
+    }
+    candidates = [row.id for row in query.with_entities(ResumeJob.id).limit(10)]
+    for job_id in candidates:
+        claimed = (
+            db.query(ResumeJob)
+            .filter(ResumeJob.id == job_id, _claimable())
+            .update(claim, synchronize_session=False)
+        )
+        db.commit()
+        if claimed:
+            return db.get(ResumeJob, job_id)
+    return None
+
+
+def process_job(db: Session, job: ResumeJob) -> None:
+    """
+    Run a claimed job and record the outcome. The claim is identified by the
+    attempt number it set: if the job was reclaimed as stale meanwhile, the
+    final UPDATE matches nothing and this worker leaves the job (and its file)
+    to the new owner. Skills are upserted, so a duplicate run is harmless.
+    """
+    job_id, claimed_attempt, file_path = job.id, job.attempts, job.file_path
+    try:
+        triples = asyncio.run(extract_resume_skills(file_path, job.file_kind, job.file_digest))
+        skills = upsert_user_skills(db, job.user_id, triples)
+        outcome = {
+            ResumeJob.status: "completed",
+            ResumeJob.result: [s.model_dump() for s in skills],
+            ResumeJob.error: None,
+        }
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"Resume job {job_id} failed")
+        outcome = {ResumeJob.error: str(e) or e.__class__.__name__}
+        if claimed_attempt >= settings.RESUME_JOB_MAX_ATTEMPTS:
+            outcome[ResumeJob.status] = "failed"
+        else:
+            delay = settings.RESUME_JOB_RETRY_BACKOFF_SECONDS * 2 ** (claimed_attempt - 1)
+            outcome[ResumeJob.status] = "queued"
+            outcome[ResumeJob.not_before] = datetime.now(timezone.utc) + timedelta(seconds=delay)
+    outcome[ResumeJob.finished_at] = func.now()
+    owned = (
+        db.query(ResumeJob)
+        .filter(ResumeJob.id == job_id, ResumeJob.attempts == claimed_attempt, ResumeJob.status == "running")
+        .update(outcome, synchronize_session=False)
+    )
+    db.commit()
+    if not owned:
+        logger.warning(f"Resume job {job_id} was reclaimed by another worker; discarding attempt {claimed_attempt}")
+        return
+    if outcome[ResumeJob.status] != "queued":
+        _remove_upload(file_path)
+
+
+def run_worker(once: bool = False) -> None:
+    """Claim and process jobs until interrupted (or until the queue is empty if once=True)."""
+    from app.core.database import SessionLocal
+
+    logger.info("Resume worker started")
+    next_sweep = 0.0
+    while True:
+        db = SessionLocal()
+        try:
+            if time.monotonic() >= next_sweep:
+                failed = fail_exhausted_jobs(db)
+                if failed:
+                    logger.warning(f"Failed {failed} resume jobs abandoned on their last attempt")
+                next_sweep = time.monotonic() + _SWEEP_INTERVAL_SECONDS
+            job = claim_next_job(db)
+            if job is not None:
+                process_job(db, job)
+        finally:
+            db.close()
+        if job is None:
+            if once:
+                return
+            time.sleep(settings.RESUME_WORKER_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from app.services.text_extraction import shutdown_extraction_pool
+
+    try:
+        run_worker()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_extraction_pool()
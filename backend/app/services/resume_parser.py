@@ -1,117 +1,134 @@
 from __future__ import annotations
-from typing import List
+from typing import Dict, List, Tuple
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
 from app.schemas.skill import UserSkillOut
 from app.models.skill import Skill, UserSkill
-from app.models.user import User
-from app.services.skills_service import extract_skills_from_text
+from app.schemas.user import Principal
+from app.core.config import settings
+from app.core.database import insert_ignore_conflicts
+from app.services import parse_cache
+from app.services.skills_service import SkillMatchStream, extract_skills_from_text, get_taxonomy_version
+from app.services.text_extraction import extract_text_async, iter_pdf_pages, _read_text_from_plain
+from app.utils.file_utils import spool_upload
 
-from pathlib import Path
-
-def _read_text_from_pdf(data: bytes) -> str:
-    try:
-        from PyPDF2 import PdfReader
-        import io
-        reader = PdfReader(io.BytesIO(data))
+async def _extract_text_and_skills(path: str, kind: str) -> Tuple[str, List[Tuple[str, str, str]]]:
+    if kind == ".pdf" and settings.PDF_STREAMING:
+        # Match skills page by page as pages arrive from the pool
+        matches = SkillMatchStream()
         parts: List[str] = []
-        for page in reader.pages:
-            parts.append(page.extract_text() or "")
-        return "\n".join(parts)
-    except Exception:
-        return ""
-
-def _read_text_from_docx(data: bytes) -> str:
-    try:
-        import io
-        from docx import Document
-        doc = Document(io.BytesIO(data))
-        return "\n".join(p.text for p in doc.paragraphs)
-    except Exception:
-        return ""
-
-def _read_text_from_plain(data: bytes) -> str:
-    for enc in ("utf-8", "latin-1", "utf-16"):
-        try:
-            return data.decode(enc)
-        except Exception:
-            continue
-    return ""
-
-async def persist_user_skills_from_resume(
-    file: UploadFile, db: Session, user: User
-) -> List[UserSkillOut]:
-    # Read file bytes
-    content = await file.read()
-    suffix = Path(file.filename or "").suffix.lower()
-
-    # Extract text based on type
-    text = ""
-    if suffix == ".pdf":
-        text = _read_text_from_pdf(content)
-    elif suffix in (".docx",):
-        text = _read_text_from_docx(content)
+        async for _, page_text in iter_pdf_pages(path):
+            matches.feed(page_text)
+            parts.append(page_text)
+        text = "\n".join(parts)
+        if text.strip():
+            return text, matches.results()
+        # Fallback if no text
+        text = _read_text_from_plain(path)
     else:
-        text = _read_text_from_plain(content)
-
-    # Fallback if no text
-    if not text:
-        text = _read_text_from_plain(content)
+        # Extract text based on type, in the extraction pool off the event loop
+        text = await extract_text_async(path, kind)
 
     # Extract skills using taxonomy matching
-    triples = extract_skills_from_text(text)
+    return text, extract_skills_from_text(text)
 
-    user_skill_out: List[UserSkillOut] = []
+async def extract_resume_skills(path: str, kind: str, digest: str) -> List[Tuple[str, str, str]]:
+    """Skills found in a spooled resume; repeat documents are served from the parse cache."""
+    version = get_taxonomy_version()
+    cached = parse_cache.get(digest, kind, version)
+    if cached is not None:
+        return cached[1]
+    text, triples = await _extract_text_and_skills(path, kind)
+    parse_cache.put(digest, kind, version, text, triples)
+    return triples
 
-    for name, category, subcategory in triples:
-        # Find or create Skill
-        skill = db.query(Skill).filter(Skill.name == name).first()
-        if not skill:
-            skill = Skill(
-                name=name,
-                category="technical",  # using taxonomy category
-                subcategory=subcategory,
-                description=None,
-            )
-            db.add(skill)
-            db.flush()  # get skill.id without full commit
+def bulk_upsert_user_skills(
+    db: Session, skills_by_user: Dict[int, List[Tuple[str, str, str]]]
+) -> Dict[int, List[UserSkillOut]]:
+    """
+    Set-based find-or-create of Skill and UserSkill rows for one or more
+    users in a single transaction: a constant number of round-trips
+    regardless of how many users or skills are involved.
+    """
+    skills_by_user = {uid: triples for uid, triples in skills_by_user.items() if triples}
+    if not skills_by_user:
+        return {}
+    subcategories: Dict[str, str] = {}
+    for triples in skills_by_user.values():
+        for name, _, subcategory in triples:
+            subcategories.setdefault(name, subcategory)
 
-        # Check existing UserSkill
-        us = (
+    # Find existing Skills in one query, bulk-insert the missing ones
+    skills = {s.name: s for s in db.query(Skill).filter(Skill.name.in_(list(subcategories))).all()}
+    missing = [
+        {
+            "name": name,
+            "category": "technical",  # using taxonomy category
+            "subcategory": subcategory,
+            "description": None,
+        }
+        for name, subcategory in subcategories.items()
+        if name not in skills
+    ]
+    if missing:
+        insert_ignore_conflicts(db, Skill, missing)
+        added = db.query(Skill).filter(Skill.name.in_([m["name"] for m in missing])).all()
+        skills.update({s.name: s for s in added})
+
+    # Upsert UserSkills; rows users already have are left untouched
+    wanted = {(uid, skills[name].id): name for uid, triples in skills_by_user.items() for name, _, _ in triples}
+
+    def _load_user_skills(pairs) -> dict:
+        user_ids = {uid for uid, _ in pairs}
+        skill_ids = {sid for _, sid in pairs}
+        rows = (
             db.query(UserSkill)
-            .filter(UserSkill.user_id == user.id, UserSkill.skill_id == skill.id)
-            .first()
+            .filter(UserSkill.user_id.in_(user_ids), UserSkill.skill_id.in_(skill_ids))
+            .all()
         )
-        if not us:
-            us = UserSkill(
-                user_id=user.id,
-                skill_id=skill.id,
-                proficiency_level=30.0,  # initial estimate
-                confidence_level=50.0,
-                years_of_experience=None,
-                source="resume",
-                evidence=f"Detected in resume: {name}",
-                is_learning_goal=False,
-                target_proficiency=70.0,
-                priority="medium",
-            )
-            db.add(us)
-            db.flush()
+        return {(us.user_id, us.skill_id): us for us in rows if (us.user_id, us.skill_id) in pairs}
 
-        user_skill_out.append(
-            UserSkillOut(
-                id=us.id,
-                skill_id=skill.id,
-                proficiency_level=us.proficiency_level,
-                confidence_level=us.confidence_level,
-                years_of_experience=us.years_of_experience,
-                source=us.source,
-                evidence=us.evidence,
-                is_learning_goal=us.is_learning_goal,
-                target_proficiency=us.target_proficiency,
-                priority=us.priority,
-            )
+    found = _load_user_skills(set(wanted))
+    new_pairs = {pair for pair in wanted if pair not in found}
+    if new_pairs:
+        insert_ignore_conflicts(
+            db,
+            UserSkill,
+            [
+                {
+                    "user_id": uid,
+                    "skill_id": sid,
+                    "proficiency_level": 30.0,  # initial estimate
+                    "confidence_level": 50.0,
+                    "years_of_experience": None,
+                    "source": "resume",
+                    "evidence": f"Detected in resume: {wanted[(uid, sid)]}",
+                    "is_learning_goal": False,
+                    "target_proficiency": 70.0,
+                    "priority": "medium",
+                }
+                for uid, sid in sorted(new_pairs)
+            ],
         )
-
+        found.update(_load_user_skills(new_pairs))
     db.commit()
-    return user_skill_out
+
+    return {
+        uid: [UserSkillOut.model_validate(found[(uid, skills[name].id)]) for name, _, _ in triples]
+        for uid, triples in skills_by_user.items()
+    }
+
+def upsert_user_skills(db: Session, user_id: int, triples: List[Tuple[str, str, str]]) -> List[UserSkillOut]:
+    return bulk_upsert_user_skills(db, {user_id: triples}).get(user_id, [])
+
+async def persist_user_skills_from_resume(
+    file: UploadFile, db: Session, user: Principal
+) -> List[UserSkillOut]:
+    # Stream the upload to disk, enforcing size and sniffing its type
+    upload = await spool_upload(file)
+    try:
+        triples = await extract_resume_skills(upload.path, upload.kind, upload.digest)
+    finally:
+        upload.cleanup()
+
+    return upsert_user_skills(db, user.id, triples)
@@ -0,0 +1,192 @@
+"""
+Cold storage for learning paths that have been archived for a while.
+
+Every regeneration archives the previous path, so learning_paths and
+learning_path_steps would otherwise grow without bound. archive_old_paths()
+moves paths with status "archived" that have not changed for
+ARCHIVE_AFTER_DAYS into learning_path_archives: one row per path, with
+the path and its steps stored as zlib-compressed JSON. Run it periodically
+with ``python -m app.services.roadmap_archive``. Archived paths keep their
+ids; load_archived_path() and unarchive_path() let the roadmap service
+read and restore them transparently.
+"""
+from __future__ import annotations
+import json
+import logging
+import time
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import DateTime, Table, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.learning_path import LearningPath, LearningPathArchive, LearningPathStep
+from app.schemas.user import Principal
+from app.schemas.learning_path import LearningPathWithSteps
+
+logger = logging.getLogger(__name__)
+
+_PATHS: Table = LearningPath.__table__
+_STEPS: Table = LearningPathStep.__table__
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot archive value of type {type(value).__name__}")
+
+
+def _encode(path: Dict[str, Any], steps: List[Dict[str, Any]]) -> bytes:
+    raw = json.dumps({"path": path, "steps": steps}, default=_json_default, separators=(",", ":"))
+    return zlib.compress(raw.encode(), 9)
+
+
+def _restore_types(table: Table, row: Dict[str, Any]) -> Dict[str, Any]:
+    # JSON has no datetime type; turn the ISO strings back into datetimes
+    out = {}
+    for col in table.columns:
+        value = row.get(col.name)
+        if value is not None and isinstance(col.type, DateTime):
+            value = datetime.fromisoformat(value)
+        out[col.name] = value
+    return out
+
+
+def _decode(payload: bytes) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    data = json.loads(zlib.decompress(payload))
+    return _restore_types(_PATHS, data["path"]), [_restore_types(_STEPS, s) for s in data["steps"]]
+
+
+def _archive_batch(db: Session, cutoff: datetime) -> int:
+    candidates = (
+        select(LearningPath.id)
+        .where(
+            LearningPath.status == "archived",
+            func.coalesce(LearningPath.updated_at, LearningPath.created_at) < cutoff,
+        )
+        .order_by(LearningPath.id)
+        .limit(settings.ARCHIVE_BATCH_SIZE)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        # Skip paths a concurrent restore is touching
+        candidates = candidates.with_for_update(skip_locked=True)
+    path_ids = list(db.execute(candidates).scalars())
+    if not path_ids:
+        db.rollback()
+        return 0
+
+    paths = [dict(row._mapping) for row in db.execute(select(_PATHS).where(_PATHS.c.id.in_(path_ids)))]
+    steps_by_path: Dict[int, List[Dict[str, Any]]] = {pid: [] for pid in path_ids}
+    for row in db.execute(select(_STEPS).where(_STEPS.c.learning_path_id.in_(path_ids))):
+        steps_by_path[row.learning_path_id].append(dict(row._mapping))
+
+    db.execute(
+        insert(LearningPathArchive),
+        [
+            {
+                "id": p["id"],
+                "user_id": p["user_id"],
+                "title": p["title"],
+                "status": p["status"],
+                "progress_percentage": p["progress_percentage"],
+                "estimated_duration_weeks": p["estimated_duration_weeks"],
+                "created_at": p["created_at"],
+                "payload": _encode(p, steps_by_path[p["id"]]),
+            }
+            for p in paths
+        ],
+    )
+    db.execute(delete(LearningPathStep).where(LearningPathStep.learning_path_id.in_(path_ids)))
+    db.execute(delete(LearningPath).where(LearningPath.id.in_(path_ids)))
+    db.commit()
+    return len(path_ids)
+
+
+def archive_old_paths(db: Session, older_than_days: int | None = None) -> int:
+    """Move stale archived paths to cold storage in batches; returns how many moved."""
+    days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    moved = 0
+    while True:
+        n = _archive_batch(db, cutoff)
+        moved += n
+        if n < settings.ARCHIVE_BATCH_SIZE:
+            return moved
+
+
+def load_archived_path(db: Session, user: Principal, path_id: int) -> LearningPathWithSteps | None:
+    row = (
+        db.query(LearningPathArchive)
+        .filter(LearningPathArchive.id == path_id, LearningPathArchive.user_id == user.id)
+        .first()
+    )
+    if row is None:
+        return None
+    path, steps = _decode(row.payload)
+    path["progress_percentage"] = path["progress_percentage"] or 0.0
+    path["steps"] = sorted(steps, key=lambda s: s["step_number"] or 0)
+    return LearningPathWithSteps.model_validate(path)
+
+
+def load_archived_rows(db: Session, user: Principal, path_ids: List[int]) -> Dict[int, tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """Decoded (path, steps) column dicts of the user's archived paths among path_ids, in one query."""
+    if not path_ids:
+        return {}
+    rows = (
+        db.query(LearningPathArchive)
+        .filter(LearningPathArchive.user_id == user.id, LearningPathArchive.id.in_(path_ids))
+        .all()
+    )
+    return {row.id: _decode(row.payload) for row in rows}
+
+
+def unarchive_path(db: Session, user: Principal, path_id: int) -> bool:
+    """
+    Move a path back from cold storage into the hot tables under its
+    original ids. Flushes but does not commit; returns False if the user
+    has no such archived path.
+    """
+    row = (
+        db.query(LearningPathArchive)
+        .filter(LearningPathArchive.id == path_id, LearningPathArchive.user_id == user.id)
+        .first()
+    )
+    if row is None:
+        return False
+    path, steps = _decode(row.payload)
+    db.execute(insert(_PATHS), [path])
+    if steps:
+        db.execute(insert(_STEPS), steps)
+    db.delete(row)
+    db.flush()
+    return True
+
+
+def run_archiver(once: bool = False) -> None:
+    """Archive stale paths every ARCHIVE_INTERVAL_SECONDS (or a single pass if once=True)."""
+    from app.core.database import SessionLocal
+
+    logger.info("Learning path archiver started")
+    while True:
+        db = SessionLocal()
+        try:
+            moved = archive_old_paths(db)
+            logger.info(f"Archived {moved} learning paths")
+        except Exception:
+            db.rollback()
+            logger.exception("Learning path archival failed")
+        finally:
+            db.close()
+        if once:
+            return
+        time.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        run_archiver()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,171 @@
+"""
+Compare the step titles of several learning paths inside the database.
+
+Titles are normalized (trimmed, lowercased) and grouped in one query over
+learning_path_steps; each title comes back with a bitmask of the paths
+that contain it, from which overlap and per-path differences follow
+directly. Paths in cold storage are decoded from their archive rows and
+merged into the same masks. Results are cached under the path ids plus each
+path's last-modified fingerprint, so any edit to a compared path misses the
+cache.
+"""
+from __future__ import annotations
+from typing import Dict, List, Tuple
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.learning_path import LearningPath, LearningPathStep
+from app.schemas.user import Principal
+from app.services.roadmap_archive import load_archived_rows
+from app.utils.cache import TTLCache
+
+_COMPARE_CACHE = TTLCache(
+    "roadmap_compare",
+    maxsize=settings.ROADMAP_COMPARE_CACHE_SIZE,
+    ttl=settings.ROADMAP_COMPARE_CACHE_TTL_SECONDS,
+)
+
+_LIVE_STEP = or_(LearningPathStep.status.is_(None), LearningPathStep.status != "retired")
+
+
+def _path_summaries(db: Session, user: Principal, path_ids: List[int]) -> Dict[int, dict]:
+    step_stats = (
+        select(
+            LearningPathStep.learning_path_id.label("path_id"),
+            func.count(LearningPathStep.id).label("steps_count"),
+            func.max(func.coalesce(LearningPathStep.updated_at, LearningPathStep.created_at)).label("steps_modified"),
+        )
+        .where(LearningPathStep.learning_path_id.in_(path_ids), _LIVE_STEP)
+        .group_by(LearningPathStep.learning_path_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            LearningPath.id,
+            LearningPath.title,
+            LearningPath.created_at,
+            LearningPath.updated_at,
+            step_stats.c.steps_count,
+            step_stats.c.steps_modified,
+        )
+        .outerjoin(step_stats, step_stats.c.path_id == LearningPath.id)
+        .where(LearningPath.user_id == user.id, LearningPath.id.in_(path_ids))
+    ).all()
+    return {row.id: row._mapping for row in rows}
+
+
+def _archived_paths(db: Session, user: Principal, path_ids: List[int]) -> Dict[int, Tuple[dict, set]]:
+    """Summary and normalized live-step titles of each path found in cold storage."""
+    out: Dict[int, Tuple[dict, set]] = {}
+    for pid, (path, steps) in load_archived_rows(db, user, path_ids).items():
+        live = [step for step in steps if step.get("status") != "retired"]
+        summary = {
+            "title": path["title"],
+            "created_at": path["created_at"],
+            # Archived paths cannot change until restored, which gives them a hot fingerprint
+            "updated_at": "archived",
+            "steps_modified": None,
+            "steps_count": len(live),
+        }
+        out[pid] = (summary, {(step.get("title") or "").strip(" ").lower() for step in live})
+    return out
+
+
+def _title_masks(db: Session, path_ids: List[int]) -> List[Tuple[str, int]]:
+    """(normalized title, bitmask of path positions containing it), one query."""
+    key = func.lower(func.trim(LearningPathStep.title))
+    bit = case(
+        *((LearningPathStep.learning_path_id == pid, 1 << i) for i, pid in enumerate(path_ids)),
+        else_=0,
+    )
+    pairs = (
+        select(key.label("title"), bit.label("bit"))
+        .where(LearningPathStep.learning_path_id.in_(path_ids), _LIVE_STEP)
+        .distinct()
+        .subquery()
+    )
+    rows = db.execute(
+        select(pairs.c.title, func.sum(pairs.c.bit).label("mask"))
+        .group_by(pairs.c.title)
+        .order_by(pairs.c.title)
+    ).all()
+    return [(row.title or "", int(row.mask)) for row in rows]
+
+
+def compare_paths(db: Session, user: Principal, path_ids: List[int], min_paths: int = 2) -> dict:
+    """
+    Compare two or more of the user's paths. Returns per-path metadata,
+    titles shared by every path, titles unique to each path, and titles
+    shared by only some of the paths (with the ids that have them).
+    Repeated ids are compared once; min_paths counts distinct ids.
+    """
+    path_ids = list(dict.fromkeys(path_ids))
+    if len(path_ids) < min_paths:
+        raise ValueError("At least two learning paths are required")
+    if len(path_ids) > settings.ROADMAP_COMPARE_MAX_PATHS:
+        raise ValueError(f"At most {settings.ROADMAP_COMPARE_MAX_PATHS} learning paths can be compared")
+
+    summaries = _path_summaries(db, user, path_ids)
+    archived = _archived_paths(db, user, [pid for pid in path_ids if pid not in summaries])
+    summaries.update({pid: summary for pid, (summary, _) in archived.items()})
+    if len(summaries) != len(path_ids):
+        raise ValueError("One or more learning paths not found")
+
+    fingerprint = tuple(
+        (pid, summaries[pid]["updated_at"], summaries[pid]["steps_modified"], summaries[pid]["steps_count"])
+        for pid in path_ids
+    )
+    cached = _COMPARE_CACHE.get(fingerprint)
+    if cached is not None:
+        return cached
+
+    everyone = (1 << len(path_ids)) - 1
+    overlap: List[str] = []
+    only: Dict[int, List[str]] = {pid: [] for pid in path_ids}
+    partial: List[dict] = []
+    masks = _title_masks(db, path_ids)
+    if archived:
+        merged = dict(masks)
+        for i, pid in enumerate(path_ids):
+            for title in archived.get(pid, (None, ()))[1]:
+                merged[title] = merged.get(title, 0) | (1 << i)
+        masks = sorted(merged.items())
+    for title, mask in masks:
+        if mask == everyone:
+            overlap.append(title)
+            continue
+        members = [pid for i, pid in enumerate(path_ids) if mask & (1 << i)]
+        if len(members) == 1:
+            only[members[0]].append(title)
+        else:
+            partial.append({"title": title, "path_ids": members})
+
+    result = {
+        "paths": [
+            {
+                "id": pid,
+                "title": summaries[pid]["title"],
+                "created_at": str(summaries[pid]["created_at"]),
+                "steps_count": summaries[pid]["steps_count"] or 0,
+            }
+            for pid in path_ids
+        ],
+        "overlap_titles": overlap,
+        "only_titles": {str(pid): titles for pid, titles in only.items()},
+        "partial_titles": partial,
+    }
+    _COMPARE_CACHE.set(fingerprint, result)
+    return result
+
+
+def latest_path_ids(db: Session, user: Principal, count: int) -> List[int]:
+    """Ids of the user's most recent paths, newest first."""
+    rows = db.execute(
+        select(LearningPath.id)
+        .where(LearningPath.user_id == user.id)
+        .order_by(LearningPath.created_at.desc(), LearningPath.id.desc())
+        .limit(count)
+    ).scalars()
+    return list(rows)
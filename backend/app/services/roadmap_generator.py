@@ -1,39 +1,41 @@
 from __future__ import annotations
+import base64
+import json
+from datetime import datetime
 from typing import List, Optional, Dict, Any
+from sqlalchemy import Numeric, and_, case, cast, func, insert, or_, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import joinedload
 
-from app.models.user import User
+from app.schemas.user import Principal
 from app.models.skill import UserSkill
-from app.models.learning_path import LearningPath, LearningPathStep
-from app.schemas.learning_path import LearningPathWithSteps
-from pathlib import Path
-import json
+from app.models.learning_path import LearningPath, LearningPathArchive, LearningPathStep
+from app.schemas.learning_path import (
+    LearningPathOut,
+    LearningPathStepBatchResult,
+    LearningPathStepOut,
+    LearningPathSummary,
+    LearningPathWithSteps,
+    PathProgressOut,
+    StepProgressOut,
+)
+from app.core.config import settings
+from app.services.curated_catalog import CuratedCatalog, get_catalog
+from app.services.roadmap_archive import load_archived_path, unarchive_path
+from app.services.roadmap_compare import compare_paths
+from app.utils.cache import TTLCache
 
-_CURATED: Optional[Dict[str, List[Dict[str, Any]]]] = None
+# Drafts shared by users with the same skill profile
+_DRAFT_CACHE = TTLCache(
+    "roadmap_drafts",
+    maxsize=settings.ROADMAP_CACHE_SIZE,
+    ttl=settings.ROADMAP_CACHE_TTL_SECONDS,
+)
 
-def _load_curated() -> Dict[str, List[Dict[str, Any]]]:
-    global _CURATED
-    if _CURATED is None:
-        data_path = Path(__file__).resolve().parent.parent / "data" / "curated_content.json"
-        if data_path.exists():
-            _CURATED = json.loads(data_path.read_text(encoding="utf-8"))
-        else:
-            _CURATED = {}
-    return _CURATED
-
-def _pick_curated(skill_name: str, type_hint: str) -> Dict[str, Any]:
-    curated = _load_curated()
-    items = curated.get(skill_name, [])
-    # Try to match by type first
-    for it in items:
-        if it.get("type", "").lower() == type_hint.lower():
-            return it
-    # Fallback to first available
-    return items[0] if items else {}
+def _proficiency_bucket(level: float | None) -> int:
+    return min(int((level or 0.0) // 25), 3)
 
 def _draft_steps_from_skills(user_skills: List[UserSkill]) -> List[dict]:
-    steps: List[dict] = []
     # Sort by priority and lowest proficiency
     ordered = sorted(
         user_skills,
@@ -42,11 +44,29 @@ def _draft_steps_from_skills(user_skills: List[UserSkill]) -> List[dict]:
             us.proficiency_level or 0.0,
         ),
     )
+    # The draft depends only on the ordered skill names and the catalog, so
+    # users with the same ordered profile share one cached draft
+    catalog = get_catalog()
+    fingerprint = (
+        catalog.version,
+        tuple(
+            (us.skill.name if us.skill else "Skill", (us.priority or "medium").lower(), _proficiency_bucket(us.proficiency_level))
+            for us in ordered
+        ),
+    )
+    cached = _DRAFT_CACHE.get(fingerprint)
+    if cached is None:
+        cached = _compose_steps(catalog, [name for name, _, _ in fingerprint[1]])
+        _DRAFT_CACHE.set(fingerprint, cached)
+    # Callers get their own dicts; the cached draft stays pristine
+    return [dict(sd) for sd in cached]
+
+def _compose_steps(catalog: CuratedCatalog, skill_names: List[str]) -> List[dict]:
+    steps: List[dict] = []
     step_no = 1
-    for us in ordered:
-        name = us.skill.name if us.skill else "Skill"
+    for name in skill_names:
         # Compose a few step types per skill
-        reading = _pick_curated(name, "reading")
+        reading = catalog.pick(name, "reading")
         steps.append({
             "title": f"Primer: {name}",
             "description": f"Introductory concepts and foundations for {name}.",
@@ -59,7 +79,7 @@ def _draft_steps_from_skills(user_skills: List[UserSkill]) -> List[dict]:
             "skills_gained": [name],
         })
         step_no += 1
-        course = _pick_curated(name, "course")
+        course = catalog.pick(name, "course")
         steps.append({
             "title": f"Course: {name} fundamentals",
             "description": f"A guided course to solidify {name} fundamentals.",
@@ -87,7 +107,31 @@ def _draft_steps_from_skills(user_skills: List[UserSkill]) -> List[dict]:
             break
     return steps
 
-def generate_and_persist_learning_path(db: Session, user: User) -> LearningPathWithSteps:
+def _insert_steps(db: Session, lp_id: int, steps_data: List[dict]) -> List[int]:
+    """Insert drafted steps in a single statement; returns ids in draft order."""
+    if not steps_data:
+        return []
+    rows = [
+        {
+            "learning_path_id": lp_id,
+            "title": sd["title"],
+            "description": sd.get("description"),
+            "step_number": sd["step_number"],
+            "step_type": sd.get("step_type"),
+            "content_url": sd.get("content_url"),
+            "content_provider": sd.get("content_provider"),
+            "estimated_duration_hours": sd.get("estimated_duration_hours"),
+            "learning_objectives": sd.get("learning_objectives"),
+            "skills_gained": sd.get("skills_gained"),
+            "status": "not_started",
+            "progress_percentage": 0.0,
+        }
+        for sd in steps_data
+    ]
+    stmt = insert(LearningPathStep).returning(LearningPathStep.id, sort_by_parameter_order=True)
+    return list(db.scalars(stmt, rows))
+
+def generate_and_persist_learning_path(db: Session, user: Principal) -> LearningPathWithSteps:
     # Load user's skills with joined Skill
     user_skills = (
         db.query(UserSkill)
@@ -100,7 +144,7 @@ def generate_and_persist_learning_path(db: Session, user: User) -> LearningPathW
     db.query(LearningPath).filter(LearningPath.user_id == user.id, LearningPath.status == "active").update({LearningPath.status: "archived"})
 
     # Create a new path
-    lp = LearningPath(
+    path_fields = dict(
         user_id=user.id,
         title=f"Roadmap for {user.full_name}",
         description="A tailored learning path based on your current skills and goals.",
@@ -112,38 +156,124 @@ def generate_and_persist_learning_path(db: Session, user: User) -> LearningPathW
         progress_percentage=0.0,
         generated_by_ai=True,
     )
-    db.add(lp)
-    db.flush()
+    lp_id = db.execute(insert(LearningPath).returning(LearningPath.id), [path_fields]).scalar_one()
 
-    # Draft steps from skills and persist
+    # Draft steps from skills and persist them in one multi-row INSERT ... RETURNING
     steps_data = _draft_steps_from_skills(user_skills)
-    for sd in steps_data:
-        step = LearningPathStep(
-            learning_path_id=lp.id,
-            title=sd["title"],
-            description=sd.get("description"),
-            step_number=sd["step_number"],
-            step_type=sd.get("step_type"),
-            content_url=sd.get("content_url"),
-            content_provider=sd.get("content_provider"),
-            estimated_duration_hours=sd.get("estimated_duration_hours"),
-            learning_objectives=sd.get("learning_objectives"),
-            skills_gained=sd.get("skills_gained"),
-            status="not_started",
-        )
-        db.add(step)
+    step_ids = _insert_steps(db, lp_id, steps_data)
     db.commit()
 
-    # Reload with steps
-    full = (
+    # Build the response from what we just wrote instead of re-querying
+    return LearningPathWithSteps(
+        id=lp_id,
+        **{k: path_fields[k] for k in LearningPathOut.model_fields if k in path_fields},
+        steps=[_step_out(step_id, sd) for step_id, sd in zip(step_ids, steps_data)],
+    )
+
+# Drafted fields that incremental regeneration keeps in sync on existing steps
+_SYNCED_STEP_FIELDS = (
+    "description",
+    "step_number",
+    "step_type",
+    "content_url",
+    "content_provider",
+    "estimated_duration_hours",
+)
+
+def _step_key(title: str | None) -> str:
+    return (title or "").strip().lower()
+
+def _step_progress(status: str | None, progress_percentage: float | None) -> float:
+    # completed counts as 100 if no explicit progress was recorded
+    if progress_percentage is not None:
+        return float(progress_percentage)
+    return 100.0 if (status or "") == "completed" else 0.0
+
+def _step_out(step_id: int, sd: dict, status: str = "not_started", progress_percentage: float = 0.0) -> LearningPathStepOut:
+    fields = {k: sd.get(k) for k in LearningPathStepOut.model_fields if k not in ("id", "status", "progress_percentage")}
+    return LearningPathStepOut(id=step_id, status=status, progress_percentage=progress_percentage, **fields)
+
+def regenerate_learning_path_incremental(db: Session, user: Principal) -> LearningPathWithSteps:
+    """
+    Re-draft the active path in place: steps whose title is unchanged keep
+    their id and progress, new steps are inserted, and steps that dropped
+    out are deleted if untouched or marked "retired" if the user had
+    started them. Falls back to a full generation when there is no
+    active path.
+    """
+    active = (
         db.query(LearningPath)
-        .options(joinedload(LearningPath.steps))
-        .filter(LearningPath.id == lp.id)
+        .filter(LearningPath.user_id == user.id, LearningPath.status == "active")
+        .order_by(LearningPath.created_at.desc())
         .first()
     )
-    return full  # FastAPI + Pydantic from_attributes will serialize to LearningPathWithSteps
+    if active is None:
+        return generate_and_persist_learning_path(db, user)
+
+    user_skills = (
+        db.query(UserSkill)
+        .options(joinedload(UserSkill.skill))
+        .filter(UserSkill.user_id == user.id)
+        .all()
+    )
+    steps_data = _draft_steps_from_skills(user_skills)
+    existing = (
+        db.query(LearningPathStep)
+        .filter(LearningPathStep.learning_path_id == active.id, LearningPathStep.status != "retired")
+        .all()
+    )
+    by_key: Dict[str, LearningPathStep] = {}
+    dropped: List[LearningPathStep] = []
+    for st in existing:
+        if _step_key(st.title) in by_key:
+            dropped.append(st)  # duplicate title; keep the first
+        else:
+            by_key[_step_key(st.title)] = st
+
+    # Diff the draft against the current steps
+    kept: List[tuple] = []  # (draft, existing step)
+    added: List[dict] = []
+    updates: List[dict] = []
+    for sd in steps_data:
+        st = by_key.pop(_step_key(sd["title"]), None)
+        if st is None:
+            added.append(sd)
+            continue
+        kept.append((sd, st))
+        if any(getattr(st, f) != sd.get(f) for f in _SYNCED_STEP_FIELDS):
+            updates.append({"id": st.id, **{f: sd.get(f) for f in _SYNCED_STEP_FIELDS}})
+    dropped.extend(by_key.values())
+
+    untouched = [st.id for st in dropped if (st.status or "not_started") == "not_started" and not st.progress_percentage]
+    started = [st.id for st in dropped if st.id not in untouched]
+
+    # Snapshot what the response needs before the writes expire the ORM objects
+    kept_out = {id(sd): _step_out(st.id, sd, st.status or "not_started", st.progress_percentage or 0.0) for sd, st in kept}
+    total = sum(_step_progress(st.status, st.progress_percentage) for _, st in kept)
+    count = len(kept) + len(added)
+
+    if updates:
+        db.execute(update(LearningPathStep), updates)
+    if untouched:
+        db.query(LearningPathStep).filter(LearningPathStep.id.in_(untouched)).delete(synchronize_session=False)
+    if started:
+        db.query(LearningPathStep).filter(LearningPathStep.id.in_(started)).update(
+            {LearningPathStep.status: "retired"}, synchronize_session=False
+        )
+    added_ids = dict(zip((id(sd) for sd in added), _insert_steps(db, active.id, added)))
+
+    active.goal = user.career_goals or "Grow in current role"
+    active.progress_percentage = round(total / count, 2) if count else 0.0
+    path_out = LearningPathOut.model_validate(active)
+    db.add(active)
+    db.commit()
+
+    return LearningPathWithSteps(
+        **path_out.model_dump(),
+        steps=[kept_out.get(id(sd)) or _step_out(added_ids[id(sd)], sd) for sd in steps_data],
+    )
 
-def get_current_learning_path(db: Session, user: User) -> LearningPathWithSteps | None:
+def get_current_learning_path(db: Session, user: Principal) -> LearningPathWithSteps | None:
     full = (
         db.query(LearningPath)
         .options(joinedload(LearningPath.steps))
@@ -153,28 +283,92 @@ def get_current_learning_path(db: Session, user: User) -> LearningPathWithSteps
     )
     return full
 
-def list_learning_paths(db: Session, user: User) -> list[LearningPath]:
-    rows = (
-        db.query(LearningPath)
-        .filter(LearningPath.user_id == user.id)
-        .order_by(LearningPath.created_at.desc())
-        .all()
+def _encode_history_cursor(created_at: datetime, path_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), path_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_history_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, path_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(path_id)
+    except Exception:
+        raise ValueError("Invalid history cursor")
+
+def history_query(model, user_id, limit: Optional[int], after: Optional[tuple[datetime, int]] = None):
+    """
+    SELECT for one /history page of `model` (LearningPath or
+    LearningPathArchive), newest first, after the (created_at, id) keyset.
+    Compares the raw column so (user_id, created_at, id) indexes serve both
+    the order and the keyset predicate. limit=None selects every row.
+    """
+    query = (
+        select(
+            model.id,
+            model.title,
+            model.status,
+            model.created_at,
+            model.progress_percentage,
+            model.estimated_duration_weeks,
+        )
+        .where(model.user_id == user_id)
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit)
     )
-    return rows
+    if after:
+        after_ts, after_id = after
+        query = query.where(
+            or_(model.created_at < after_ts, and_(model.created_at == after_ts, model.id < after_id))
+        )
+    return query
+
+def _history_rows(db: Session, model, user: Principal, limit: Optional[int], after: Optional[tuple[datetime, int]]) -> list:
+    return db.execute(history_query(model, user.id, limit, after)).all()
+
+def list_learning_paths(
+    db: Session, user: Principal, limit: Optional[int] = 50, cursor: Optional[str] = None
+) -> tuple[List[LearningPathSummary], Optional[str]]:
+    """
+    One page of the user's paths, newest first, keyset-paginated on
+    (created_at, id) and projected to the summary columns only. Paths in
+    cold storage are merged in. Returns the page and the cursor for the
+    next one (None on the last page). limit=None returns every path after
+    the cursor as a single page.
+    """
+    after = _decode_history_cursor(cursor) if cursor else None
+    fetch = None if limit is None else limit + 1
+    rows = _history_rows(db, LearningPath, user, fetch, after)
+    rows += _history_rows(db, LearningPathArchive, user, fetch, after)
+    rows.sort(key=lambda r: (r.created_at is not None, r.created_at, r.id), reverse=True)
 
-def get_learning_path_by_id(db: Session, user: User, path_id: int) -> LearningPathWithSteps | None:
+    page = [LearningPathSummary(**row._mapping) for row in rows[:limit]]
+    next_cursor = None
+    if limit is not None and len(rows) > limit and page[-1].created_at is not None:
+        next_cursor = _encode_history_cursor(page[-1].created_at, page[-1].id)
+    return page, next_cursor
+
+def get_learning_path_by_id(db: Session, user: Principal, path_id: int) -> LearningPathWithSteps | None:
     row = (
         db.query(LearningPath)
         .options(joinedload(LearningPath.steps))
         .filter(LearningPath.user_id == user.id, LearningPath.id == path_id)
         .first()
     )
+    if row is None:
+        return load_archived_path(db, user, path_id)
     return row
 
-def restore_learning_path(db: Session, user: User, path_id: int) -> LearningPathWithSteps:
-    target = get_learning_path_by_id(db, user, path_id)
+def restore_learning_path(db: Session, user: Principal, path_id: int) -> LearningPathWithSteps:
+    target = (
+        db.query(LearningPath)
+        .filter(LearningPath.user_id == user.id, LearningPath.id == path_id)
+        .first()
+    )
     if not target:
-        raise ValueError("LearningPath not found")
+        # Bring it back from cold storage first
+        if not unarchive_path(db, user, path_id):
+            raise ValueError("LearningPath not found")
+        target = db.get(LearningPath, path_id)
     # Archive current active
     db.query(LearningPath).filter(
         LearningPath.user_id == user.id, LearningPath.status == "active"
@@ -186,76 +380,142 @@ def restore_learning_path(db: Session, user: User, path_id: int) -> LearningPath
     refreshed = get_learning_path_by_id(db, user, target.id)
     return refreshed
 
-def compare_learning_paths(db: Session, user: User, a_id: int, b_id: int) -> dict:
-    a = get_learning_path_by_id(db, user, a_id)
-    b = get_learning_path_by_id(db, user, b_id)
-    if not a or not b:
-        raise ValueError("One or both learning paths not found")
-    a_steps = {(s.title or "").strip().lower() for s in a.steps}
-    b_steps = {(s.title or "").strip().lower() for s in b.steps}
-    intersection = sorted(list(a_steps & b_steps))
-    only_a = sorted(list(a_steps - b_steps))
-    only_b = sorted(list(b_steps - a_steps))
+def compare_learning_paths(db: Session, user: Principal, a_id: int, b_id: int) -> dict:
+    # Comparing a path with itself is valid: every title overlaps
+    result = compare_paths(db, user, [a_id, b_id], min_paths=1)
+    a = result["paths"][0]
+    b = result["paths"][-1]
     return {
-        "a": {"id": a.id, "title": a.title, "created_at": str(a.created_at), "steps_count": len(a.steps)},
-        "b": {"id": b.id, "title": b.title, "created_at": str(b.created_at), "steps_count": len(b.steps)},
-        "overlap_titles": intersection,
-        "only_a_titles": only_a,
-        "only_b_titles": only_b,
+        "a": a,
+        "b": b,
+        "overlap_titles": result["overlap_titles"],
+        "only_a_titles": result["only_titles"][str(a["id"])],
+        "only_b_titles": result["only_titles"][str(b["id"])],
     }
 
-def _recalculate_path_progress(db: Session, lp: LearningPath) -> None:
-    if not lp.steps:
-        lp.progress_percentage = 0.0
+def _refresh_path_progress(db: Session, path_ids: List[int]) -> None:
+    """
+    Recompute progress_percentage for the given paths with one aggregate
+    UPDATE: the average of step progress, where a completed step without
+    an explicit progress value counts as 100. Retired steps are ignored.
+    """
+    if not path_ids:
         return
-    # Average of step progress; completed counts as 100 if not set
-    total = 0.0
-    count = 0
-    for st in lp.steps:
-        prog = st.progress_percentage if st.progress_percentage is not None else (100.0 if (st.status or "") == "completed" else 0.0)
-        total += float(prog)
-        count += 1
-    lp.progress_percentage = round(total / max(count, 1), 2)
+    step_progress = case(
+        (LearningPathStep.progress_percentage.isnot(None), LearningPathStep.progress_percentage),
+        (LearningPathStep.status == "completed", 100.0),
+        else_=0.0,
+    )
+    avg_progress = (
+        select(func.round(cast(func.coalesce(func.avg(step_progress), 0.0), Numeric), 2))
+        .where(
+            LearningPathStep.learning_path_id == LearningPath.id,
+            func.coalesce(LearningPathStep.status, "") != "retired",
+        )
+        .scalar_subquery()
+    )
+    db.execute(
+        update(LearningPath)
+        .where(LearningPath.id.in_(path_ids))
+        .values(progress_percentage=avg_progress)
+        .execution_options(synchronize_session=False)
+    )
 
 def update_step_progress(
     db: Session,
-    user: User,
+    user: Principal,
     step_id: int,
     *,
     status: str | None = None,
     progress_percentage: float | None = None,
 ) -> LearningPathWithSteps:
-    # Load step with its path and ensure ownership
-    step = (
-        db.query(LearningPathStep)
-        .join(LearningPath, LearningPath.id == LearningPathStep.learning_path_id)
-        .options(joinedload(LearningPathStep.learning_path).joinedload(LearningPath.steps))
-        .filter(LearningPathStep.id == step_id, LearningPath.user_id == user.id)
-        .first()
-    )
-    if not step:
-        raise ValueError("Step not found or not owned by user")
-
+    values: Dict[str, Any] = {}
     if status is not None:
-        step.status = status
+        values["status"] = status
     if progress_percentage is not None:
         # clamp 0..100
-        step.progress_percentage = float(max(0.0, min(100.0, progress_percentage)))
+        values["progress_percentage"] = float(max(0.0, min(100.0, progress_percentage)))
 
-    db.add(step)
-    db.flush()
+    # Update the step only if the user owns its path; touches just the step row
+    owned = LearningPathStep.learning_path_id.in_(
+        select(LearningPath.id).where(LearningPath.user_id == user.id)
+    )
+    if values:
+        path_id = db.execute(
+            update(LearningPathStep)
+            .where(LearningPathStep.id == step_id, owned)
+            .values(**values)
+            .returning(LearningPathStep.learning_path_id)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+    else:
+        path_id = db.execute(
+            select(LearningPathStep.learning_path_id).where(LearningPathStep.id == step_id, owned)
+        ).scalar_one_or_none()
+    if path_id is None:
+        db.rollback()
+        raise ValueError("Step not found or not owned by user")
 
-    # Recalculate path progress
-    lp = step.learning_path
-    _recalculate_path_progress(db, lp)
-    db.add(lp)
+    # Recalculate path progress in the database
+    _refresh_path_progress(db, [path_id])
     db.commit()
 
     # Return the full path with steps
     full = (
         db.query(LearningPath)
         .options(joinedload(LearningPath.steps))
-        .filter(LearningPath.id == lp.id)
+        .filter(LearningPath.id == path_id)
         .first()
     )
     return full
+
+def update_steps_progress_batch(db: Session, user: Principal, changes: List[dict]) -> LearningPathStepBatchResult:
+    """
+    Apply many step status/progress changes in one transaction, refresh
+    each affected path's progress once, and return only what changed.
+    Later changes to the same step win. Steps the user does not own are
+    reported in not_found and skipped.
+    """
+    merged: Dict[int, Dict[str, Any]] = {}
+    for ch in changes:
+        values = merged.setdefault(ch["step_id"], {})
+        if ch.get("status") is not None:
+            values["status"] = ch["status"]
+        if ch.get("progress_percentage") is not None:
+            # clamp 0..100
+            values["progress_percentage"] = float(max(0.0, min(100.0, ch["progress_percentage"])))
+    if not merged:
+        return LearningPathStepBatchResult()
+
+    owned = dict(
+        db.execute(
+            select(LearningPathStep.id, LearningPathStep.learning_path_id)
+            .join(LearningPath, LearningPath.id == LearningPathStep.learning_path_id)
+            .where(LearningPathStep.id.in_(list(merged)), LearningPath.user_id == user.id)
+        ).all()
+    )
+    not_found = sorted(step_id for step_id in merged if step_id not in owned)
+    rows = [{"id": step_id, **values} for step_id, values in merged.items() if step_id in owned and values]
+    if rows:
+        db.execute(update(LearningPathStep), rows)
+    path_ids = sorted({owned[r["id"]] for r in rows})
+    _refresh_path_progress(db, path_ids)
+
+    steps = db.execute(
+        select(
+            LearningPathStep.id,
+            LearningPathStep.learning_path_id,
+            LearningPathStep.status,
+            LearningPathStep.progress_percentage,
+        ).where(LearningPathStep.id.in_([r["id"] for r in rows]))
+    ).all() if rows else []
+    paths = db.execute(
+        select(LearningPath.id, LearningPath.progress_percentage).where(LearningPath.id.in_(path_ids))
+    ).all() if path_ids else []
+    db.commit()
+
+    return LearningPathStepBatchResult(
+        steps=[StepProgressOut(**row._mapping) for row in steps],
+        paths=[PathProgressOut(id=row.id, progress_percentage=row.progress_percentage or 0.0) for row in paths],
+        not_found=not_found,
+    )
@@ -1,47 +1,316 @@
 """
 Skill taxonomy loading and simple extraction utilities.
+
+The taxonomy and aliases are compiled into a versioned TaxonomySnapshot
+(taxonomy dict + token index). Snapshots can be prebuilt offline with
+``python -m app.services.skills_service`` and are swapped atomically when
+the source JSON changes or reload_taxonomy() is called; extraction calls
+already running keep the snapshot they started with.
 """
 from __future__ import annotations
+import hashlib
 import json
+import logging
+import os
+import pickle
+import re
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+from app.core.config import settings
 
-# Cache for taxonomy
-_TAXONOMY: Dict[str, Dict[str, List[str]]] | None = None
+logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 TAXONOMY_PATH = DATA_DIR / "skills_taxonomy.json"
+ALIASES_PATH = DATA_DIR / "skill_aliases.json"
+COMPILED_PATH = DATA_DIR / "skills_taxonomy.pkl"
 
+# Bump when the pickled layout of TaxonomySnapshot/_SkillIndex changes
+_COMPILED_FORMAT = 1
 
-def get_taxonomy() -> Dict[str, Dict[str, List[str]]]:
-    global _TAXONOMY
-    if _TAXONOMY is None:
-        with TAXONOMY_PATH.open("r", encoding="utf-8") as f:
-            _TAXONOMY = json.load(f)
-    return _TAXONOMY
+# A token is a run of word characters plus the punctuation that shows up
+# inside skill names ("c#", "c++", "node.js", "ci/cd", "scikit-learn").
+# Separators are only kept when followed by another word character, so a
+# sentence-final "Python." still tokenizes as "python".
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:[./\-_][a-z0-9+#]+)*")
+# Compound tokens that are not known skills are retried split on these
+# (e.g. "react/node.js" -> "react", "node.js"; "python-based" -> "python").
+_SPLIT_RE = re.compile(r"[/\-]")
 
 
-def extract_skills_from_text(text: str) -> List[Tuple[str, str, str]]:
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into skill-aware tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class _SkillIndex:
     """
-    Return list of (skill_name, category, subcategory) found in text.
-    Case-insensitive exact phrase matching for a curated taxonomy.
+    Inverted index from normalized token n-grams to taxonomy entries.
+
+    Matching is one hash lookup per (position, n) pair, with n bounded by
+    the longest phrase, so cost is linear in the text and independent of
+    taxonomy size. Phrases only match on whole tokens: "go" does not match
+    inside "google" and "sql" does not match inside "postgresql".
     """
-    if not text:
-        return []
-    tokens = text.lower()
-    results: List[Tuple[str, str, str]] = []
-    seen = set()
-    tax = get_taxonomy()
 
+    def __init__(self) -> None:
+        self._phrases: Dict[Tuple[str, ...], int] = {}
+        self._vocab: set[str] = set()
+        self._max_len = 0
+        self.entries: List[Tuple[str, str, str]] = []
+
+    def add_entry(self, entry: Tuple[str, str, str]) -> int:
+        self.entries.append(entry)
+        return len(self.entries) - 1
+
+    def add_phrase(self, phrase: str, entry_id: int) -> None:
+        key = tuple(tokenize(phrase))
+        # First registration wins, so canonical names take precedence
+        # over aliases and earlier taxonomy entries over later ones.
+        if not key or key in self._phrases:
+            return
+        self._phrases[key] = entry_id
+        self._vocab.update(key)
+        self._max_len = max(self._max_len, len(key))
+
+    def _expand(self, tokens: Iterable[str]) -> List[str]:
+        out: List[str] = []
+        for tok in tokens:
+            if tok in self._vocab:
+                out.append(tok)
+            else:
+                out.extend(p for p in _SPLIT_RE.split(tok) if p)
+        return out
+
+    @property
+    def max_ngram(self) -> int:
+        return self._max_len
+
+    def search(self, text: str) -> List[int]:
+        """Return ids of all entries whose phrase occurs in text, in taxonomy order."""
+        return self.search_tokens(self.tokens(text))
+
+    def tokens(self, text: str) -> List[str]:
+        """Tokens of text as search_tokens() expects them."""
+        return self._expand(tokenize(text))
+
+    def search_tokens(self, tokens: List[str]) -> List[int]:
+        found = set()
+        for i in range(len(tokens)):
+            if tokens[i] not in self._vocab:
+                continue
+            for n in range(1, min(self._max_len, len(tokens) - i) + 1):
+                entry_id = self._phrases.get(tuple(tokens[i:i + n]))
+                if entry_id is not None:
+                    found.add(entry_id)
+        return sorted(found)
+
+
+def _build_index(
+    tax: Dict[str, Dict[str, List[str]]], aliases: Dict[str, List[str]]
+) -> _SkillIndex:
+    index = _SkillIndex()
+    by_name: Dict[str, int] = {}
     for category, subs in tax.items():
         for subcategory, names in subs.items():
             for name in names:
                 key = name.strip()
-                if not key:
+                if not key or key.lower() in by_name:
                     continue
-                lname = key.lower()
-                # Basic containment check; could be improved with word boundaries
-                if lname in tokens and key.lower() not in seen:
-                    seen.add(lname)
-                    results.append((key, category, subcategory))
-    return results
+                entry_id = index.add_entry((key, category, subcategory))
+                by_name[key.lower()] = entry_id
+                index.add_phrase(key, entry_id)
+    for canonical, alias_list in aliases.items():
+        entry_id = by_name.get(canonical.strip().lower())
+        if entry_id is None:
+            continue
+        for alias in alias_list:
+            index.add_phrase(alias, entry_id)
+    return index
+
+
+class TaxonomySnapshot:
+    """Immutable compiled view of the taxonomy, identified by a content hash."""
+
+    def __init__(
+        self,
+        version: str,
+        taxonomy: Dict[str, Dict[str, List[str]]],
+        aliases: Dict[str, List[str]],
+        index: _SkillIndex,
+    ) -> None:
+        self.version = version
+        self.taxonomy = taxonomy
+        self.aliases = aliases
+        self.index = index
+
+
+# Current snapshot; replaced wholesale, never mutated in place
+_SNAPSHOT: TaxonomySnapshot | None = None
+# (mtime_ns, size) of the source files the current snapshot was loaded from
+_SOURCE_STAMP: Tuple[Tuple[int, int], ...] | None = None
+_LAST_CHECK = 0.0
+_RELOAD_LOCK = threading.Lock()
+
+
+def _source_stamp() -> Tuple[Tuple[int, int], ...]:
+    stamp = []
+    for path in (TAXONOMY_PATH, ALIASES_PATH):
+        try:
+            st = path.stat()
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            stamp.append((0, 0))
+    return tuple(stamp)
+
+
+def _read_sources() -> Tuple[bytes, bytes]:
+    tax_bytes = TAXONOMY_PATH.read_bytes()
+    alias_bytes = ALIASES_PATH.read_bytes() if ALIASES_PATH.exists() else b"{}"
+    return tax_bytes, alias_bytes
+
+
+def _version_of(tax_bytes: bytes, alias_bytes: bytes) -> str:
+    digest = hashlib.sha256()
+    digest.update(tax_bytes)
+    digest.update(b"\0")
+    digest.update(alias_bytes)
+    return digest.hexdigest()[:16]
+
+
+def compile_snapshot() -> TaxonomySnapshot:
+    """Build a snapshot from the JSON sources."""
+    tax_bytes, alias_bytes = _read_sources()
+    taxonomy = json.loads(tax_bytes)
+    aliases = json.loads(alias_bytes)
+    return TaxonomySnapshot(
+        _version_of(tax_bytes, alias_bytes), taxonomy, aliases, _build_index(taxonomy, aliases)
+    )
+
+
+def write_compiled(snapshot: TaxonomySnapshot, path: Path = COMPILED_PATH) -> None:
+    """Persist a snapshot for workers to load; written via rename so readers never see a partial file."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        pickle.dump((_COMPILED_FORMAT, snapshot), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _load_compiled(version: str) -> TaxonomySnapshot | None:
+    if not COMPILED_PATH.exists():
+        return None
+    try:
+        with COMPILED_PATH.open("rb") as f:
+            fmt, snapshot = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable compiled taxonomy {COMPILED_PATH}: {e}")
+        return None
+    if fmt != _COMPILED_FORMAT or snapshot.version != version:
+        return None
+    return snapshot
+
+
+def _load_snapshot() -> TaxonomySnapshot:
+    # Prefer the prebuilt artifact when it matches the current sources
+    tax_bytes, alias_bytes = _read_sources()
+    snapshot = _load_compiled(_version_of(tax_bytes, alias_bytes))
+    return snapshot if snapshot is not None else compile_snapshot()
+
+
+def reload_taxonomy() -> TaxonomySnapshot:
+    """Load the taxonomy from disk and atomically swap it in."""
+    global _SNAPSHOT, _SOURCE_STAMP, _LAST_CHECK
+    with _RELOAD_LOCK:
+        stamp = _source_stamp()
+        snapshot = _load_snapshot()
+        _SNAPSHOT, _SOURCE_STAMP = snapshot, stamp
+        _LAST_CHECK = time.monotonic()
+    return snapshot
+
+
+def _maybe_refresh() -> None:
+    global _SNAPSHOT, _SOURCE_STAMP, _LAST_CHECK
+    interval = settings.TAXONOMY_RELOAD_INTERVAL_SECONDS
+    if interval <= 0 or time.monotonic() - _LAST_CHECK < interval:
+        return
+    # Another thread is already reloading; keep serving the current snapshot
+    if not _RELOAD_LOCK.acquire(blocking=False):
+        return
+    try:
+        _LAST_CHECK = time.monotonic()
+        stamp = _source_stamp()
+        if stamp == _SOURCE_STAMP:
+            return
+        snapshot = _load_snapshot()
+        if _SNAPSHOT is None or snapshot.version != _SNAPSHOT.version:
+            logger.info(f"Skills taxonomy reloaded: version {snapshot.version}")
+        _SNAPSHOT, _SOURCE_STAMP = snapshot, stamp
+    except Exception as e:
+        logger.warning(f"Skills taxonomy reload failed, keeping current version: {e}")
+    finally:
+        _RELOAD_LOCK.release()
+
+
+def get_snapshot() -> TaxonomySnapshot:
+    if _SNAPSHOT is None:
+        return reload_taxonomy()
+    _maybe_refresh()
+    return _SNAPSHOT
+
+
+def get_taxonomy() -> Dict[str, Dict[str, List[str]]]:
+    return get_snapshot().taxonomy
+
+
+def get_taxonomy_version() -> str:
+    return get_snapshot().version
+
+
+def extract_skills_from_text(text: str) -> List[Tuple[str, str, str]]:
+    """
+    Return list of (skill_name, category, subcategory) found in text.
+    Case-insensitive whole-token phrase matching for a curated taxonomy,
+    including aliases from skill_aliases.json (e.g. "k8s" -> Kubernetes).
+    """
+    if not text:
+        return []
+    # Hold one snapshot for the whole call so a concurrent swap cannot mix versions
+    index = get_snapshot().index
+    return [index.entries[i] for i in index.search(text)]
+
+
+class SkillMatchStream:
+    """
+    Accumulate skill matches over text that arrives in pieces (e.g. PDF
+    pages), pinned to one taxonomy snapshot for its whole lifetime.
+    """
+
+    def __init__(self) -> None:
+        self._index = get_snapshot().index
+        self._found: set[int] = set()
+        # Last max_ngram - 1 tokens of the previous piece, so a phrase split
+        # across pieces ("Machine" / "Learning") still matches
+        self._carry: List[str] = []
+
+    def feed(self, text: str) -> None:
+        if not text:
+            return
+        tokens = self._carry + self._index.tokens(text)
+        self._found.update(self._index.search_tokens(tokens))
+        keep = self._index.max_ngram - 1
+        self._carry = tokens[-keep:] if keep > 0 else []
+
+    def results(self) -> List[Tuple[str, str, str]]:
+        return [self._index.entries[i] for i in sorted(self._found)]
+
+
+if __name__ == "__main__":
+    # Import under the package name so pickled classes resolve in workers
+    from app.services import skills_service as _svc
+
+    snap = _svc.compile_snapshot()
+    _svc.write_compiled(snap)
+    print(f"Compiled {len(snap.index.entries)} skills to {_svc.COMPILED_PATH} (version {snap.version})")
@@ -0,0 +1,280 @@
+"""
+Resume text extraction, run in a bounded process pool off the event loop.
+
+Parsers read the upload from its spooled temp file path, so workers never
+receive a pickled copy of the document. PDF/DOCX parsing is CPU-bound, so doing it inline in an ``async def``
+endpoint stalls every other request on the worker. extract_text_async()
+hands the job to a ProcessPoolExecutor, refuses new work once
+EXTRACTION_MAX_PENDING jobs are queued or running, and gives up waiting
+after EXTRACTION_TIMEOUT_SECONDS.
+
+PDFs can also be parsed page-range by page-range across the pool with
+iter_pdf_pages(), which yields page text in order as it arrives and stops
+once the PDF_MAX_PAGES / PDF_MAX_CHARS budget is reached.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, List, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionSaturated(Exception):
+    """Raised when the extraction queue is full."""
+
+
+class ExtractionTimeout(Exception):
+    """Raised when a job does not finish within the configured timeout."""
+
+
+def _read_text_from_pdf(path: str) -> str:
+    try:
+        from PyPDF2 import PdfReader
+        reader = PdfReader(path)
+        parts: List[str] = []
+        for page in reader.pages:
+            parts.append(page.extract_text() or "")
+        return "\n".join(parts)
+    except Exception:
+        return ""
+
+def _read_pdf_page_range(path: str, start: int, end: int) -> Tuple[int, List[Tuple[int, str, float]]]:
+    """Return (page_count, [(page_no, text, seconds), ...]) for pages [start, end)."""
+    try:
+        from PyPDF2 import PdfReader
+        reader = PdfReader(path)
+        total = len(reader.pages)
+        pages: List[Tuple[int, str, float]] = []
+        for i in range(start, min(end, total)):
+            t0 = time.perf_counter()
+            try:
+                text = reader.pages[i].extract_text() or ""
+            except Exception:
+                text = ""
+            pages.append((i, text, time.perf_counter() - t0))
+        return total, pages
+    except Exception:
+        return 0, []
+
+def _read_text_from_docx(path: str) -> str:
+    try:
+        from docx import Document
+        doc = Document(path)
+        return "\n".join(p.text for p in doc.paragraphs)
+    except Exception:
+        return ""
+
+def _read_text_from_plain(path: str) -> str:
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return ""
+    for enc in ("utf-8", "latin-1", "utf-16"):
+        try:
+            return data.decode(enc)
+        except Exception:
+            continue
+    return ""
+
+def extract_text(path: str, kind: str) -> str:
+    """Extract text from a spooled upload based on its sniffed type (a file suffix)."""
+    if kind == ".pdf":
+        text = _read_text_from_pdf(path)
+    elif kind in (".docx",):
+        text = _read_text_from_docx(path)
+    else:
+        text = _read_text_from_plain(path)
+
+    # Fallback if no text
+    if not text:
+        text = _read_text_from_plain(path)
+    return text
+
+
+_EXECUTOR: Executor | None = None
+# Threads for page-range jobs when EXTRACTION_MAX_WORKERS is 0; they need
+# real concurrent futures, which the loop's default executor does not expose
+_THREAD_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+# Jobs submitted but not yet finished (including timed-out ones that are
+# still running in a worker), guarded by _EXECUTOR_LOCK
+_PENDING = 0
+
+
+def _get_executor() -> Executor | None:
+    global _EXECUTOR
+    if settings.EXTRACTION_MAX_WORKERS <= 0:
+        return None  # parse on the event loop's default thread pool instead
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ProcessPoolExecutor(max_workers=settings.EXTRACTION_MAX_WORKERS)
+        return _EXECUTOR
+
+
+def _submit(executor: Executor | None, fn, *args) -> Future:
+    global _THREAD_EXECUTOR
+    if executor is None:
+        with _EXECUTOR_LOCK:
+            if _THREAD_EXECUTOR is None:
+                _THREAD_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="pdf-extract")
+            executor = _THREAD_EXECUTOR
+    return executor.submit(fn, *args)
+
+
+def _acquire_slot() -> None:
+    global _PENDING
+    with _EXECUTOR_LOCK:
+        if _PENDING >= settings.EXTRACTION_MAX_PENDING:
+            raise ExtractionSaturated("Resume extraction queue is full")
+        _PENDING += 1
+
+
+def _release_slot(_: object = None) -> None:
+    global _PENDING
+    with _EXECUTOR_LOCK:
+        _PENDING -= 1
+
+
+async def run_in_extraction_pool(fn, *args):
+    """Run fn(*args) in the extraction pool, enforcing queue depth and timeout."""
+    _acquire_slot()
+    loop = asyncio.get_running_loop()
+    try:
+        fut = loop.run_in_executor(_get_executor(), fn, *args)
+    except Exception:
+        _release_slot()
+        raise
+    # Release the slot only when the job really finishes, not when we stop waiting
+    fut.add_done_callback(_release_slot)
+    try:
+        return await asyncio.wait_for(asyncio.shield(fut), settings.EXTRACTION_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise ExtractionTimeout("Resume extraction timed out")
+
+
+def _release_after(futures: List[Future]) -> None:
+    """
+    Release one slot once every job in a multi-job extraction has finished.
+
+    Takes the executor's own futures: a cancelled asyncio wrapper reports
+    done() while the job it wraps may still be running in a worker.
+    """
+    pending = [f for f in futures if not f.done()]
+    if not pending:
+        _release_slot()
+        return
+    remaining = [len(pending)]
+
+    def _done(_: object) -> None:
+        remaining[0] -= 1
+        if remaining[0] == 0:
+            _release_slot()
+
+    for f in pending:
+        f.add_done_callback(_done)
+
+
+class PdfParseStats:
+    """Per-document numbers for tuning the PDF page/character budget."""
+
+    def __init__(self) -> None:
+        self.page_count = 0
+        self.pages_parsed = 0
+        self.chars = 0
+        self.page_seconds: List[float] = []
+        self.stopped_early = False
+        self.elapsed_seconds = 0.0
+
+    def as_dict(self) -> dict:
+        avg = sum(self.page_seconds) / len(self.page_seconds) if self.page_seconds else 0.0
+        return {
+            "page_count": self.page_count,
+            "pages_parsed": self.pages_parsed,
+            "chars": self.chars,
+            "avg_page_ms": round(avg * 1000, 2),
+            "max_page_ms": round(max(self.page_seconds, default=0.0) * 1000, 2),
+            "stopped_early": self.stopped_early,
+            "elapsed_ms": round(self.elapsed_seconds * 1000, 2),
+        }
+
+
+async def iter_pdf_pages(path: str, stats: PdfParseStats | None = None) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Yield (page_no, text) in page order, parsing PDF_PAGES_PER_JOB pages per
+    pool job with up to EXTRACTION_MAX_WORKERS jobs in flight. The whole
+    document counts as one slot against EXTRACTION_MAX_PENDING.
+    """
+    stats = stats if stats is not None else PdfParseStats()
+    _acquire_slot()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.EXTRACTION_TIMEOUT_SECONDS
+    executor = _get_executor()
+    per_job = max(1, settings.PDF_PAGES_PER_JOB)
+    window = max(1, settings.EXTRACTION_MAX_WORKERS)
+    max_pages = settings.PDF_MAX_PAGES if settings.PDF_MAX_PAGES > 0 else None
+    max_chars = settings.PDF_MAX_CHARS if settings.PDF_MAX_CHARS > 0 else None
+    launched: List[Future] = []
+    inflight: deque = deque()
+    next_start = 0
+    page_count: int | None = None
+    started = time.perf_counter()
+    try:
+        while True:
+            # Only the first range is launched until the page count is known
+            limit = page_count if page_count is not None else per_job
+            if max_pages is not None:
+                limit = min(limit, max_pages)
+            while len(inflight) < window and next_start < limit:
+                end = min(next_start + per_job, limit)
+                job = _submit(executor, _read_pdf_page_range, path, next_start, end)
+                launched.append(job)
+                inflight.append(asyncio.wrap_future(job))
+                next_start = end
+            if not inflight:
+                break
+            try:
+                total, pages = await asyncio.wait_for(
+                    asyncio.shield(inflight.popleft()), max(deadline - loop.time(), 0)
+                )
+            except asyncio.TimeoutError:
+                raise ExtractionTimeout("Resume extraction timed out")
+            page_count = stats.page_count = total
+            for page_no, text, seconds in pages:
+                stats.pages_parsed += 1
+                stats.chars += len(text)
+                stats.page_seconds.append(seconds)
+                yield page_no, text
+                if max_chars is not None and stats.chars >= max_chars:
+                    stats.stopped_early = stats.pages_parsed < total
+                    return
+        if max_pages is not None and page_count is not None and page_count > max_pages:
+            stats.stopped_early = True
+    finally:
+        # Cancels jobs that have not started; running ones finish before their slot is released
+        for fut in inflight:
+            fut.cancel()
+        _release_after(launched)
+        stats.elapsed_seconds = time.perf_counter() - started
+        logger.info(f"PDF extraction stats: {stats.as_dict()}")
+
+
+async def extract_text_async(path: str, kind: str) -> str:
+    return await run_in_extraction_pool(extract_text, path, kind)
+
+
+def shutdown_extraction_pool() -> None:
+    global _EXECUTOR, _THREAD_EXECUTOR
+    with _EXECUTOR_LOCK:
+        executors = (_EXECUTOR, _THREAD_EXECUTOR)
+        _EXECUTOR = _THREAD_EXECUTOR = None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,4 +1,12 @@
+import hashlib
+import os
+import tempfile
 from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+
+from app.core.config import settings
 
 UPLOADS_DIR = Path("uploads")
 STATIC_DIR = Path("static")
@@ -6,3 +14,118 @@ STATIC_DIR = Path("static")
 # Ensure directories exist at runtime
 UPLOADS_DIR.mkdir(exist_ok=True)
 STATIC_DIR.mkdir(exist_ok=True)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Leading bytes of the binary formats we accept
+_MAGIC = (
+    (b"%PDF-", ".pdf"),
+    (b"PK\x03\x04", ".docx"),  # OOXML is a zip container
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", ".doc"),  # OLE2 compound file
+)
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds MAX_FILE_SIZE."""
+
+
+class UnsupportedFileType(Exception):
+    """Raised when an upload's extension or content is not an accepted type."""
+
+
+def sniff_file_type(head: bytes) -> Optional[str]:
+    """Return the document type (as a file suffix) from its leading bytes, or None."""
+    for magic, kind in _MAGIC:
+        if head.startswith(magic):
+            return kind
+    # UTF-16 text has NULs, so check its BOM before the binary test
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")) or b"\x00" not in head:
+        return ".txt"
+    return None
+
+
+class SpooledUpload:
+    """An upload written to a temp file on disk; delete it with cleanup()."""
+
+    def __init__(self, path: str, kind: str, size: int, digest: str) -> None:
+        self.path = path
+        self.kind = kind
+        self.size = size
+        self.digest = digest
+
+    def cleanup(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class _SpoolWriter:
+    """Write chunks to a temp file, hashing, sniffing and size-checking as they arrive."""
+
+    def __init__(self, suffix: str) -> None:
+        self._digest = hashlib.sha256()
+        self._size = 0
+        self._kind: Optional[str] = None
+        fd, self._path = tempfile.mkstemp(prefix="upload-", suffix=suffix, dir=UPLOADS_DIR)
+        self._out = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        if self._kind is None:
+            self._kind = sniff_file_type(chunk[:4096])
+            if self._kind is None:
+                raise UnsupportedFileType("File content is not a supported document type")
+        self._size += len(chunk)
+        if self._size > settings.MAX_FILE_SIZE:
+            raise UploadTooLarge(f"File exceeds {settings.MAX_FILE_SIZE} bytes")
+        self._digest.update(chunk)
+        self._out.write(chunk)
+
+    def finish(self) -> SpooledUpload:
+        self._out.close()
+        return SpooledUpload(self._path, self._kind or ".txt", self._size, self._digest.hexdigest())
+
+    def abort(self) -> None:
+        self._out.close()
+        os.remove(self._path)
+
+
+def _check_extension(filename: Optional[str]) -> str:
+    suffix = Path(filename or "").suffix.lower()
+    if suffix not in settings.ALLOWED_EXTENSIONS:
+        raise UnsupportedFileType(f"Unsupported file extension: {suffix or '(none)'}")
+    return suffix
+
+
+async def spool_upload(file: UploadFile) -> SpooledUpload:
+    """
+    Copy an upload to a temp file in chunks, hashing as it goes and
+    rejecting it as soon as it exceeds MAX_FILE_SIZE. The type is taken
+    from the magic bytes, not the client-supplied name or content type.
+    """
+    writer = _SpoolWriter(_check_extension(file.filename))
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish()
+
+
+def spool_fileobj(fileobj: BinaryIO, filename: str) -> SpooledUpload:
+    """Synchronous spool_upload() for file-like objects such as zip archive members."""
+    writer = _SpoolWriter(_check_extension(filename))
+    try:
+        while True:
+            chunk = fileobj.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish()
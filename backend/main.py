@@ -9,6 +9,10 @@ from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
 from app.api.api_v1.api import api_router
 from app.core.database import engine
+from app.core.middleware import BodySizeLimitMiddleware, RateLimitMiddleware
+from app.core.rate_limit import MemoryBucketStore, SqliteBucketStore
+from app.core.security import shutdown_hashing_pool
+from app.services.text_extraction import shutdown_extraction_pool
 from app.models import Base
 from pathlib import Path
 import logging
@@ -17,11 +21,13 @@ import logging
 Path("static").mkdir(exist_ok=True)
 Path("uploads").mkdir(exist_ok=True)
 
-# Create database tables (non-fatal if DB is unavailable)
-try:
-    Base.metadata.create_all(bind=engine)
-except Exception as e:
-    logging.warning(f"Database unavailable during startup: {e}. API will still start; health and non-DB endpoints will function.")
+# Create database tables (non-fatal if DB is unavailable). Migrations in
+# alembic/ adopt databases created this way.
+if settings.AUTO_CREATE_TABLES:
+    try:
+        Base.metadata.create_all(bind=engine)
+    except Exception as e:
+        logging.warning(f"Database unavailable during startup: {e}. API will still start; health and non-DB endpoints will function.")
 
 app = FastAPI(
     title="MyOwnGuru API",
@@ -30,6 +36,20 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# Throttle the expensive routes; added before CORS so 429s still carry CORS headers
+if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMITS:
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        rate_limit_store = SqliteBucketStore(settings.RATE_LIMIT_SQLITE_PATH)
+    else:
+        rate_limit_store = MemoryBucketStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    app.add_middleware(
+        RateLimitMiddleware,
+        store=rate_limit_store,
+        limits=settings.RATE_LIMITS,
+        prefix=settings.API_V1_STR,
+        trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED,
+    )
+
 # Set up CORS
 app.add_middleware(
     CORSMiddleware,
@@ -42,6 +62,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paging cursor for /roadmap/history
+    expose_headers=["X-Next-Cursor"],
+)
+
+# Cut off oversized bodies while they stream in; the allowance on top of
+# MAX_FILE_SIZE covers multipart boundaries and form fields
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_size=settings.MAX_FILE_SIZE + 64 * 1024,
+    path_limits={f"{settings.API_V1_STR}/resume/import": settings.MAX_IMPORT_SIZE},
 )
 
 # Include API router
@@ -50,6 +80,11 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+@app.on_event("shutdown")
+def shutdown_workers():
+    shutdown_extraction_pool()
+    shutdown_hashing_pool()
+
 @app.get("/")
 async def root():
     return {
@@ -0,0 +1,196 @@
+"""
+Show query plans and timings for the per-user hot queries before and after
+the index migrations.
+
+Builds a database at the baseline revision (0001, the schema create_all()
+used to produce), seeds it with synthetic users, skills and learning paths,
+runs EXPLAIN and a timing loop for each query, upgrades to head and repeats.
+
+    cd backend
+    python scripts/benchmark_query_plans.py                  # throwaway SQLite file
+    python scripts/benchmark_query_plans.py --url postgresql+psycopg://...  # empty scratch database
+
+Never point --url at a database you care about: it is migrated and filled
+with synthetic rows.
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import create_engine, insert, table, column, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.models.learning_path import LearningPath  # noqa: E402
+from app.services.roadmap_generator import history_query  # noqa: E402
+
+# The queries behind /roadmap/current, step updates and /users/me/skills;
+# /roadmap/history pages are compiled from the app's own statement (_history_sql)
+QUERIES: Dict[str, str] = {
+    "active path": (
+        "SELECT id, title, progress_percentage FROM learning_paths "
+        "WHERE user_id = :user_id AND status = 'active'"
+    ),
+    "path steps": (
+        "SELECT id, title, step_number, status, progress_percentage FROM learning_path_steps "
+        "WHERE learning_path_id = :path_id ORDER BY step_number"
+    ),
+    "path progress": (
+        "SELECT avg(progress_percentage) FROM learning_path_steps "
+        "WHERE learning_path_id = :path_id"
+    ),
+    "user skills": (
+        "SELECT id, skill_id, proficiency_level FROM user_skills WHERE user_id = :user_id"
+    ),
+}
+
+
+def _alembic_config(url: str) -> Config:
+    cfg = Config(str(BACKEND_DIR / "alembic.ini"))
+    cfg.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    cfg.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return cfg
+
+
+def _history_sql(engine: Engine, user_id: int, after=None) -> str:
+    # list_learning_paths() fetches one row past the default page size of 50
+    stmt = history_query(LearningPath, user_id, 51, after)
+    return str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _seed(engine: Engine, users: int, paths_per_user: int, steps_per_path: int, skills_per_user: int) -> None:
+    rng = random.Random(42)
+    t_users = table("users", column("id"), column("email"), column("username"), column("full_name"), column("hashed_password"))
+    t_skills = table("skills", column("id"), column("name"), column("category"))
+    t_user_skills = table("user_skills", column("user_id"), column("skill_id"), column("proficiency_level"))
+    t_paths = table("learning_paths", column("id"), column("user_id"), column("title"), column("status"), column("progress_percentage"), column("created_at"))
+    t_steps = table("learning_path_steps", column("learning_path_id"), column("title"), column("step_number"), column("status"), column("progress_percentage"))
+
+    n_skills = max(skills_per_user * 4, 100)
+    epoch = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(t_skills), [{"id": i, "name": f"skill-{i}", "category": "technical"} for i in range(1, n_skills + 1)])
+        conn.execute(insert(t_users), [
+            {"id": u, "email": f"u{u}@example.com", "username": f"user{u}", "full_name": f"User {u}", "hashed_password": "x"}
+            for u in range(1, users + 1)
+        ])
+        conn.execute(insert(t_user_skills), [
+            {"user_id": u, "skill_id": s, "proficiency_level": rng.uniform(0, 100)}
+            for u in range(1, users + 1)
+            for s in rng.sample(range(1, n_skills + 1), skills_per_user)
+        ])
+        path_id = 0
+        for u in range(1, users + 1):
+            paths, steps = [], []
+            for p in range(paths_per_user):
+                path_id += 1
+                paths.append({
+                    "id": path_id,
+                    "user_id": u,
+                    "title": f"Roadmap {p}",
+                    "status": "active" if p == paths_per_user - 1 else "archived",
+                    "progress_percentage": 0.0,
+                    "created_at": epoch + timedelta(days=p),
+                })
+                steps.extend(
+                    {"learning_path_id": path_id, "title": f"Step {n}", "step_number": n, "status": "not_started", "progress_percentage": 0.0}
+                    for n in range(1, steps_per_path + 1)
+                )
+            conn.execute(insert(t_paths), paths)
+            conn.execute(insert(t_steps), steps)
+        conn.execute(text("ANALYZE"))
+
+
+def _explain(engine: Engine, sql: str, params: dict) -> List[str]:
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.execute(text(prefix + sql), params).all()
+    # SQLite: (id, parent, notused, detail); PostgreSQL: one text column
+    return [str(row[-1]) for row in rows]
+
+
+def _time_ms(engine: Engine, sql: str, params: dict, repeat: int) -> float:
+    with engine.connect() as conn:
+        stmt = text(sql)
+        conn.execute(stmt, params).all()  # warm up
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(stmt, params).all()
+        return (time.perf_counter() - started) * 1000 / repeat
+
+
+def _measure(engine: Engine, queries: Dict[str, str], params: dict, repeat: int) -> Dict[str, tuple]:
+    return {name: (_explain(engine, sql, params), _time_ms(engine, sql, params, repeat)) for name, sql in queries.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: a temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--paths-per-user", type=int, default=20)
+    parser.add_argument("--steps-per-path", type=int, default=12)
+    parser.add_argument("--skills-per-user", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.url
+    if not url:
+        tmpdir = tempfile.mkdtemp(prefix="plan-bench-")
+        url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    engine = create_engine(url)
+    cfg = _alembic_config(url)
+    command.upgrade(cfg, "0001")
+    _seed(engine, args.users, args.paths_per_user, args.steps_per_path, args.skills_per_user)
+
+    # A user in the middle of the id range, and their active path
+    user_id = args.users // 2 or 1
+    params = {"user_id": user_id, "path_id": user_id * args.paths_per_user}
+    # Keyset for a page starting halfway through that user's history (see _seed)
+    middle = args.paths_per_user // 2
+    after = (datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(days=middle), (user_id - 1) * args.paths_per_user + middle + 1)
+    queries = {
+        "history page": _history_sql(engine, user_id),
+        "history next page": _history_sql(engine, user_id, after),
+        **QUERIES,
+    }
+
+    before = _measure(engine, queries, params, args.repeat)
+    command.upgrade(cfg, "head")
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    after_plans = _measure(engine, queries, params, args.repeat)
+
+    print(f"{engine.dialect.name}: {args.users} users x {args.paths_per_user} paths x {args.steps_per_path} steps\n")
+    for name in queries:
+        (plan_b, ms_b), (plan_a, ms_a) = before[name], after_plans[name]
+        print(f"== {name}: {ms_b:.3f} ms -> {ms_a:.3f} ms ({ms_b / ms_a if ms_a else 0:.1f}x)")
+        print("   before:")
+        for line in plan_b:
+            print(f"     {line}")
+        print("   after:")
+        for line in plan_a:
+            print(f"     {line}")
+        print()
+
+    engine.dispose()
+    if tmpdir:
+        for f in Path(tmpdir).iterdir():
+            f.unlink()
+        os.rmdir(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
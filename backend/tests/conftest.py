@@ -0,0 +1,19 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Settings are read at import time, so point the app at a throwaway database
+# (never the developer's .env one) before any test module imports `app`
+_tmp = tempfile.mkdtemp(prefix="myownguru-tests-")
+atexit.register(shutil.rmtree, _tmp, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["DEBUG"] = "false"
+# The API tests register many users from one client; tests/test_middleware.py
+# covers the limiter on its own app
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+# Make the `app` package importable when pytest runs from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,49 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+P = "/api/v1"
+
+
+def _register() -> dict:
+    name = f"user{uuid.uuid4().hex[:8]}"
+    r = client.post(P + "/auth/register", json={
+        "email": f"{name}@example.com",
+        "username": name,
+        "full_name": name,
+        "password": "secret12",
+    })
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_refresh_rotates_token():
+    tokens = _register()
+    r = client.post(P + "/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert r.status_code == 200
+    assert r.json()["refresh_token"] != tokens["refresh_token"]
+
+    me = client.get(P + "/users/me", headers={"Authorization": f"Bearer {r.json()['access_token']}"})
+    assert me.status_code == 200
+
+
+def test_replayed_refresh_token_revokes_family():
+    tokens = _register()
+    first = client.post(P + "/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert first.status_code == 200
+    successor = first.json()["refresh_token"]
+
+    replay = client.post(P + "/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    assert replay.headers["www-authenticate"] == "Bearer"
+    # Reuse means the token leaked, so the rotated successor dies with it
+    r = client.post(P + "/auth/refresh", json={"refresh_token": successor})
+    assert r.status_code == 401
+
+
+def test_unknown_refresh_token_rejected():
+    r = client.post(P + "/auth/refresh", json={"refresh_token": "not-a-token"})
+    assert r.status_code == 401
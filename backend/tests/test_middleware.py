@@ -0,0 +1,115 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.middleware import BodySizeLimitMiddleware, RateLimitMiddleware
+from app.core.rate_limit import MemoryBucketStore
+from app.core.security import create_access_token
+
+LIMIT = 1024
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    app.add_middleware(BodySizeLimitMiddleware, max_body_size=LIMIT)
+    return TestClient(app)
+
+
+def _multipart(payload: bytes) -> tuple[bytes, dict]:
+    boundary = "testboundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="cv.txt"\r\n'
+        "Content-Type: text/plain\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, {"content-type": f"multipart/form-data; boundary={boundary}"}
+
+
+def _chunked(body: bytes, size: int = 256):
+    # A generator body makes httpx send Transfer-Encoding: chunked, no Content-Length
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+def test_small_upload_passes():
+    body, headers = _multipart(b"x" * 100)
+    r = _client().post("/upload", content=body, headers=headers)
+    assert r.status_code == 200
+    assert r.json() == {"size": 100}
+
+
+def test_oversized_content_length_rejected():
+    body, headers = _multipart(b"x" * (LIMIT * 4))
+    r = _client().post("/upload", content=body, headers=headers)
+    assert r.status_code == 413
+
+
+def test_oversized_chunked_upload_rejected():
+    body, headers = _multipart(b"x" * (LIMIT * 4))
+    r = _client().post("/upload", content=_chunked(body), headers=headers)
+    assert "content-length" not in r.request.headers
+    assert r.status_code == 413
+    assert r.json() == {"detail": "Request body too large"}
+
+
+def _limited_client() -> TestClient:
+    app = FastAPI()
+
+    @app.post("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/api/free")
+    async def free():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        store=MemoryBucketStore(),
+        limits={"POST /ping": "2/minute"},
+        prefix="/api",
+        trust_forwarded=True,
+    )
+    return TestClient(app)
+
+
+def _auth(username: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': username})}"}
+
+
+def test_rate_limit_rejects_with_retry_after():
+    client = _limited_client()
+    assert [client.post("/api/ping").status_code for _ in range(2)] == [200, 200]
+    r = client.post("/api/ping")
+    assert r.status_code == 429
+    assert r.json() == {"detail": "Rate limit exceeded"}
+    assert 1 <= int(r.headers["retry-after"]) <= 30
+    # Routes without a configured budget are untouched
+    assert client.get("/api/free").status_code == 200
+
+
+def test_rate_limit_ip_bucket_shared_by_users():
+    client = _limited_client()
+    ip = {"X-Forwarded-For": "203.0.113.5"}
+    assert client.post("/api/ping", headers={**ip, **_auth("alice")}).status_code == 200
+    assert client.post("/api/ping", headers={**ip, **_auth("bob")}).status_code == 200
+    # A third account from the same address gets no fresh budget
+    assert client.post("/api/ping", headers={**ip, **_auth("carol")}).status_code == 429
+    assert client.post("/api/ping", headers={"X-Forwarded-For": "203.0.113.6"}).status_code == 200
+
+
+def test_rate_limit_user_bucket_shared_by_ips():
+    client = _limited_client()
+    for i in range(2):
+        r = client.post("/api/ping", headers={"X-Forwarded-For": f"198.51.100.{i}", **_auth("alice")})
+        assert r.status_code == 200
+    r = client.post("/api/ping", headers={"X-Forwarded-For": "198.51.100.9", **_auth("alice")})
+    assert r.status_code == 429
+    assert "retry-after" in r.headers
+    # An invalid token falls back to the IP bucket alone
+    r = client.post("/api/ping", headers={"X-Forwarded-For": "198.51.100.9", "Authorization": "Bearer junk"})
+    assert r.status_code == 200
@@ -0,0 +1,107 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.models.learning_path import LearningPath, LearningPathArchive
+from app.services.roadmap_archive import archive_old_paths
+from main import app
+
+client = TestClient(app)
+P = "/api/v1"
+
+
+def _headers() -> dict:
+    name = f"user{uuid.uuid4().hex[:8]}"
+    r = client.post(P + "/auth/register", json={
+        "email": f"{name}@example.com",
+        "username": name,
+        "full_name": name,
+        "password": "secret12",
+    })
+    assert r.status_code == 200
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _generate(headers: dict, n: int) -> list:
+    ids = []
+    for _ in range(n):
+        r = client.post(P + "/roadmap/generate", headers=headers)
+        assert r.status_code == 200
+        ids.append(r.json()["id"])
+    return ids
+
+
+def test_history_cursor_paging():
+    headers = _headers()
+    ids = _generate(headers, 3)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        r = client.get(P + "/roadmap/history", headers=headers, params=params)
+        assert r.status_code == 200
+        assert len(r.json()) <= 2
+        seen += [row["id"] for row in r.json()]
+        cursor = r.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert seen == sorted(ids, reverse=True)
+
+    # Without limit or cursor the whole history comes back in one page
+    r = client.get(P + "/roadmap/history", headers=headers)
+    assert [row["id"] for row in r.json()] == seen
+    assert "x-next-cursor" not in r.headers
+
+
+def test_history_bad_cursor():
+    r = client.get(P + "/roadmap/history", headers=_headers(), params={"cursor": "garbage"})
+    assert r.status_code == 400
+
+
+def test_archive_restore_round_trip():
+    headers = _headers()
+    old_id, current_id = _generate(headers, 2)
+    before = client.get(P + f"/roadmap/{old_id}", headers=headers).json()
+
+    db = SessionLocal()
+    try:
+        assert archive_old_paths(db, older_than_days=0) >= 1
+        assert db.get(LearningPath, old_id) is None
+        assert db.get(LearningPathArchive, old_id) is not None
+        assert db.get(LearningPath, current_id) is not None
+    finally:
+        db.close()
+
+    # Archived paths are still readable and listed under the same id
+    r = client.get(P + f"/roadmap/{old_id}", headers=headers)
+    assert r.status_code == 200
+    assert [s["title"] for s in r.json()["steps"]] == [s["title"] for s in before["steps"]]
+    history = client.get(P + "/roadmap/history", headers=headers).json()
+    assert {row["id"] for row in history} == {old_id, current_id}
+
+    r = client.post(P + f"/roadmap/{old_id}/restore", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["id"] == old_id
+    assert len(r.json()["steps"]) == len(before["steps"])
+
+    db = SessionLocal()
+    try:
+        assert db.get(LearningPath, old_id) is not None
+        assert db.get(LearningPathArchive, old_id) is None
+    finally:
+        db.close()
+
+
+def test_archived_path_hidden_from_other_users():
+    owner = _headers()
+    old_id, _ = _generate(owner, 2)
+    db = SessionLocal()
+    try:
+        archive_old_paths(db, older_than_days=0)
+    finally:
+        db.close()
+
+    r = client.get(P + f"/roadmap/{old_id}", headers=_headers())
+    assert r.json() is None
+    assert client.get(P + f"/roadmap/{old_id}", headers=owner).json()["id"] == old_id